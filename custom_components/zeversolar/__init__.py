@@ -1,26 +1,68 @@
 """The Zeversolar integration."""
 import asyncio
 import logging
+import time
 from datetime import timedelta, datetime
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import sun
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-import requests
 
+from .api import ZeversolarClient, ZeversolarError, get_request_budget, get_single_flight
+from .breaker import CircuitBreaker
+from .clock import DeviceClock
 from .const import (
     DOMAIN,
+    DATA_SCHEDULER,
+    DATA_VALIDATED,
+    VALIDATED_MAX_AGE,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_RAMP_THRESHOLD,
+    DEFAULT_HEARTBEAT_INTERVAL,
     CONF_URL,
+    CONF_SCAN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_RAMP_THRESHOLD,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_SAMPLE_INTERVAL,
+    CONF_GAP_POLICY,
+    CONF_EXTERNAL_STATISTICS,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_GAP_POLICY,
+    MAX_UPDATE_DEADLINE,
+    PROBE_TIMEOUT,
+    UPDATE_DEADLINE_FRACTION,
     ATTR_INVERTER_STATUS,
 )
+from .external_statistics import HourlyStatistics, ZeversolarStatisticsImporter
+from .history import PowerHistory, SampleWindow
+from .integrator import EnergyIntegrator
+from .lifetime import LifetimeEnergy
+from .metrics import DeviceMetrics
+from .parser import GatewaySnapshot, ZeversolarParseError, parse_home
+from .scheduler import PollStats, ZeversolarPollScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor"]
 
+# Key of the gateway aggregate in stored per-inverter state
+_STORE_GATEWAY = "gateway"
+
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the Zeversolar component."""
@@ -30,13 +72,60 @@ async def async_setup(hass: HomeAssistant, config: dict):
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Zeversolar from a config entry."""
-    url = entry.data[CONF_URL]
+    url = entry.options.get(CONF_URL, entry.data[CONF_URL])
+
+    coordinator = ZeversolarDataUpdateCoordinator(hass, url, entry.options, entry.entry_id)
 
-    coordinator = ZeversolarDataUpdateCoordinator(hass, url)
-    await coordinator.async_config_entry_first_refresh()
+    validated = hass.data[DOMAIN].get(DATA_VALIDATED, {}).pop(url, None)
+    poll_now = False
+    if validated is not None and hass.loop.time() - validated[0] < VALIDATED_MAX_AGE:
+        # The config flow just fetched home.cgi; start warm from that response
+        coordinator.async_seed(validated[1], validated[2])
+    else:
+        # Never block setup on the device. The snapshot saved before the
+        # restart is published right away and the scheduler runs the first
+        # live poll as soon as a poll slot is free.
+        await coordinator.async_restore()
+        poll_now = True
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    # All entries share one scheduler that spreads their polls over the interval
+    scheduler = hass.data[DOMAIN].get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DOMAIN][DATA_SCHEDULER] = ZeversolarPollScheduler(hass)
+    unregister = scheduler.async_register(coordinator, poll_now=poll_now)
+    entry.async_on_unload(unregister)
+    entry.async_on_unload(coordinator.async_schedule_rollover())
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    @callback
+    def _async_check_serial_number():
+        """Tie the entry to the reported serial number; never poll a device twice."""
+        data = coordinator.last_successful_data
+        if data is None or not data.serial_number or entry.unique_id == data.serial_number:
+            return
+        for other in hass.config_entries.async_entries(DOMAIN):
+            if other.entry_id != entry.entry_id and other.unique_id == data.serial_number:
+                _LOGGER.error(
+                    "Zeversolar %s at %s is already configured as '%s'; "
+                    "polling of '%s' has stopped, please remove it",
+                    data.serial_number,
+                    coordinator.url,
+                    other.title,
+                    entry.title,
+                )
+                remove_listener()
+                unregister()
+                # Do not leave the last live reading frozen on the entities
+                coordinator.async_set_updated_data(data.as_offline())
+                return
+        hass.config_entries.async_update_entry(entry, unique_id=data.serial_number)
+
+    remove_listener = coordinator.async_add_listener(_async_check_serial_number)
+    entry.async_on_unload(remove_listener)
+    _async_check_serial_number()
+
     for platform in PLATFORMS:
         hass.async_create_task(
             hass.config_entries.async_forward_entry_setup(entry, platform)
@@ -61,92 +150,516 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     return unload_ok
 
 
+async def async_remove_config_entry_device(
+    hass: HomeAssistant, entry: ConfigEntry, device_entry: DeviceEntry
+):
+    """Allow removing an inverter the stick no longer reports."""
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is None or coordinator.data is None:
+        return False
+    for domain, serial in device_entry.identifiers:
+        if domain != DOMAIN:
+            continue
+        if serial == coordinator.data.serial_number or serial in coordinator.data.inverters:
+            return False
+        coordinator.async_forget_inverter(serial)
+    return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the stored snapshot of a deleted config entry."""
+    await _async_get_store(hass, entry.entry_id).async_remove()
+
+
+def _async_get_store(hass, entry_id):
+    """Return the store holding the last snapshot of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Reload the config entry when its options change."""
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is not None and dict(entry.options) == coordinator.options:
+        # Only the unique ID or title changed
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 class ZeversolarDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Zeversolar data."""
 
-    def __init__(self, hass, url):
+    def __init__(self, hass, url, options=None, entry_id=None):
         """Initialize."""
+        options = options or {}
+        self.options = dict(options)
         self.url = url
-        self.data = {}
-        self.last_successful_data = {}
+        self._store = _async_get_store(hass, entry_id) if entry_id else None
+        self.client = ZeversolarClient(
+            async_get_clientsession(hass),
+            url,
+            single_flight=get_single_flight(hass),
+            budget=get_request_budget(hass),
+        )
+        self.data = None
+        self.last_successful_data = None
+        self.scan_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self.poll_interval = timedelta(seconds=self.scan_interval)
+        self.adaptive_polling = options.get(CONF_ADAPTIVE_POLLING, False)
+        self.min_scan_interval = options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
+        self.max_scan_interval = options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+        self.ramp_threshold = options.get(CONF_RAMP_THRESHOLD, DEFAULT_RAMP_THRESHOLD)
+        self._last_power = None
+        self._last_power_time = None
+
+        # High-frequency mode: sample every sample_interval seconds and publish
+        # time-weighted aggregates once per scan_interval.
+        self.sample_interval = options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL)
+        if self.sample_interval:
+            self.poll_interval = timedelta(seconds=self.sample_interval)
+            self.adaptive_polling = False
+        self.windows = {}
+        self.published = {}
+        self.held_updates = 0
+        self._last_publish = None
+        self._hold_listeners = False
+        self.poll_stats = PollStats()
+        self.breaker = CircuitBreaker()
+        self.metrics = DeviceMetrics()
+
+        # Inverters that have entities; an inverter missing from a snapshot
+        # stays here until the user removes its device
+        self.known_inverters = set()
 
+        # Recent samples per inverter serial; None holds the gateway aggregate
+        self.history = {}
+
+        # Integrated energy per inverter serial, keyed like history
+        self.gap_policy = options.get(CONF_GAP_POLICY, DEFAULT_GAP_POLICY)
+        self.integrators = {}
+
+        # Lifetime, month and year energy from the integrated daily totals,
+        # keyed like history
+        self.lifetime = {}
+
+        # The device day follows the stick's clock and only changes in the
+        # scheduled rollover, so updates compare dates without computing them.
+        self.clock = DeviceClock(dt_util.DEFAULT_TIME_ZONE)
+        self.day = self.clock.day_at(time.time())
+        self.rollovers = 0
+        self._unsub_rollover = None
+
+        # Optional hourly rows imported as external statistics, keyed like history
+        self.hourly_statistics = {}
+        self.statistics_importer = (
+            ZeversolarStatisticsImporter(hass)
+            if options.get(CONF_EXTERNAL_STATISTICS, False)
+            else None
+        )
+
+        # Change detection: an identical home.cgi body is not parsed again
+        # and does not wake the entities, except for an optional heartbeat.
+        self.heartbeat_interval = 60 * options.get(
+            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+        )
+        self.delivered_updates = 0
+        self.skipped_updates = 0
+        self._last_body = None
+        self._last_delivery = 0.0
+        self._skip_listeners = False
+
+        # Overlap protection: a tick that arrives while an update is still
+        # running is skipped rather than sending a second request.
+        self._update_running = False
+        self._drop_listeners = False
+
+        # Polls are driven by the shared ZeversolarPollScheduler, so the
+        # coordinator does not schedule its own refreshes.
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=None,
         )
 
+    @callback
+    def async_forget_inverter(self, serial):
+        """Forget an inverter whose device the user removed."""
+        self.known_inverters.discard(serial)
+        if self.lifetime.pop(serial, None) is not None and self._store is not None:
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
     async def _async_update_data(self):
         """Update data via library."""
+        if self._update_running:
+            _LOGGER.debug("Update of %s still running, skipping this tick", self.url)
+            self.metrics.skipped_ticks += 1
+            self._drop_listeners = True
+            return self.data
+        self._update_running = True
+        try:
+            return await self._async_update_data_locked()
+        finally:
+            self._update_running = False
+
+    async def _async_update_data_locked(self):
+        """Run one update; only one runs at a time."""
+        data = await self._async_get_data()
+        if data is self.last_successful_data:
+            # A live sample, whether or not the body changed
+            self._integrate(data)
+        if self.sample_interval:
+            self._sample(data)
+        elif self.adaptive_polling:
+            self._adapt_poll_interval(data)
+        return data
+
+    async def async_restore(self):
+        """Load the snapshot saved before the last restart.
+
+        The restored snapshot is published as offline until a live sample
+        arrives. Return True if there was anything to restore.
+        """
+        if self._store is None:
+            return False
+        stored = await self._store.async_load()
+        if not stored:
+            return False
+        for key, state in stored.get("energy", {}).items():
+            integrator = EnergyIntegrator(self.gap_policy)
+            integrator.restore(state)
+            self.integrators[None if key == _STORE_GATEWAY else key] = integrator
+        for key, state in stored.get("lifetime", {}).items():
+            lifetime = LifetimeEnergy()
+            lifetime.restore(state)
+            self.lifetime[None if key == _STORE_GATEWAY else key] = lifetime
+        if self.statistics_importer is not None:
+            for key, state in stored.get("hourly", {}).items():
+                hourly = HourlyStatistics()
+                hourly.restore(state)
+                self.hourly_statistics[None if key == _STORE_GATEWAY else key] = hourly
+        if not stored.get("body"):
+            return False
         try:
-            return await self.hass.async_add_executor_job(self.fetch_data)
-        except Exception as error:
-            _LOGGER.error("Error communicating with Zeversolar: %s", error)
-            # Return last successful data if available, otherwise return offline status
-            if self.last_successful_data:
-                offline_data = self.last_successful_data.copy()
-                offline_data["inverter_status"] = "Offline"
-                offline_data["current_power"] = 0
-                return offline_data
+            snapshot = parse_home(stored["body"])
+        except ZeversolarParseError as error:
+            _LOGGER.warning("Ignoring stored Zeversolar snapshot for %s: %s", self.url, error)
+            return False
+
+        self._last_body = stored["body"]
+        self.last_successful_data = snapshot
+        self.data = snapshot.as_offline()
+        return True
+
+    @callback
+    def async_seed(self, body, snapshot):
+        """Start from a live response fetched moments ago by the config flow."""
+        self._last_body = body
+        self.last_successful_data = snapshot
+        self.data = snapshot
+        self._record_history(snapshot)
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_schedule_rollover(self, day=None):
+        """Schedule the start of the stick's next day; return a cancel callback.
+
+        Without a day, the current device day is taken from the clock
+        estimate; the day never steps back, which would reset the daily
+        totals a second time.
+        """
+        if self._unsub_rollover is not None:
+            self._unsub_rollover()
+        if day is None:
+            day = max(self.day, self.clock.day_at(time.time()))
+        self.day = day
+        self._unsub_rollover = async_track_point_in_utc_time(
+            self.hass,
+            self._async_rollover,
+            dt_util.utc_from_timestamp(self.clock.rollover_time(day)),
+        )
+        return self._async_cancel_rollover
+
+    @callback
+    def _async_rollover(self, _now):
+        """Start the next device day."""
+        self._unsub_rollover = None
+        self.rollovers += 1
+        # Never step back, and catch up if the host was suspended
+        day = max(self.day + timedelta(days=1), self.clock.day_at(time.time()))
+        _LOGGER.debug("Zeversolar at %s rolled over to %s", self.url, day)
+        self.async_schedule_rollover(day)
+        # Close the day on time, even if no sample arrives overnight
+        for lifetime in self.lifetime.values():
+            lifetime.roll_over(day)
+        if self.lifetime and self._store is not None:
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _async_cancel_rollover(self):
+        """Cancel the scheduled rollover."""
+        if self._unsub_rollover is not None:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+
+    @callback
+    def _data_to_store(self):
+        """Return the data written to the store."""
+        return {
+            "body": self._last_body,
+            "energy": {
+                _STORE_GATEWAY if serial is None else serial: integrator.as_dict()
+                for serial, integrator in self.integrators.items()
+            },
+            "lifetime": {
+                _STORE_GATEWAY if serial is None else serial: lifetime.as_dict()
+                for serial, lifetime in self.lifetime.items()
+            },
+            "hourly": {
+                _STORE_GATEWAY if serial is None else serial: hourly.as_dict()
+                for serial, hourly in self.hourly_statistics.items()
+            },
+        }
+
+    @callback
+    def async_update_listeners(self):
+        """Update listeners unless the last poll returned unchanged data."""
+        if self._drop_listeners:
+            self._drop_listeners = False
+            return
+        if self._hold_listeners:
+            self._hold_listeners = False
+            self._skip_listeners = False
+            self.held_updates += 1
+            return
+        if self._skip_listeners:
+            self._skip_listeners = False
+            self.skipped_updates += 1
+            return
+        self.delivered_updates += 1
+        self._last_delivery = self.hass.loop.time()
+        super().async_update_listeners()
+
+    def _sample(self, data):
+        """Fold a sample into the publish windows and hold it until due.
+
+        Listeners are only updated once per scan interval, with the mean and
+        maximum power and the energy integrated over the samples since the
+        previous update.
+        """
+        now = self.hass.loop.time()
+        windows = self.windows
+        if data is self.last_successful_data:
+            inverters = data.inverters if len(data.inverters) > 1 else {}
+            if len(windows) > len(inverters) + 1:
+                for serial in [serial for serial in windows if serial is not None and serial not in inverters]:
+                    del windows[serial]
+            for serial, block in ((None, data), *inverters.items()):
+                window = windows.get(serial)
+                if window is None:
+                    window = windows[serial] = SampleWindow(3 * self.sample_interval)
+                window.add(now, block.current_power)
+
+        if self._last_publish is not None and now - self._last_publish < self.scan_interval:
+            self._hold_listeners = True
+            return
+
+        self._last_publish = now
+        published = {}
+        for serial, window in windows.items():
+            aggregate = window.publish()
+            if aggregate is not None:
+                published[serial] = aggregate
+        if published != self.published:
+            # New aggregates are worth a state write even if the body is unchanged
+            self._skip_listeners = False
+        self.published = published
+
+    def _integrate(self, data):
+        """Fold a live sample into the integrated energy of each inverter."""
+        timestamp = time.time()
+        current_date = self.day
+        # A gap is anything longer than a few missed polls
+        max_gap = 3 * self.poll_interval.total_seconds()
+        integrators = self.integrators
+        # Lifetime energy of inverters missing from a snapshot is kept; it
+        # is only dropped when the user removes the inverter's device
+        lifetimes = self.lifetime
+        hourly_statistics = self.hourly_statistics
+        inverters = data.inverters if len(data.inverters) > 1 else {}
+        if len(integrators) > len(inverters) + 1:
+            for serial in [serial for serial in integrators if serial is not None and serial not in inverters]:
+                del integrators[serial]
+                hourly_statistics.pop(serial, None)
+        for serial, block in ((None, data), *inverters.items()):
+            integrator = integrators.get(serial)
+            if integrator is None:
+                integrator = integrators[serial] = EnergyIntegrator(self.gap_policy)
+            if self.statistics_importer is not None:
+                hourly = hourly_statistics.get(serial)
+                if hourly is None:
+                    # Nothing stored for this key: continue from the restored
+                    # total so the energy produced while Home Assistant was
+                    # down is not lost
+                    hourly = hourly_statistics[serial] = HourlyStatistics(
+                        integrator.total if integrator.date == current_date else None
+                    )
+            integrator.update(
+                timestamp, block.current_power, block.energy_today, current_date, max_gap
+            )
+            lifetime = lifetimes.get(serial)
+            if lifetime is None:
+                lifetime = lifetimes[serial] = LifetimeEnergy()
+            lifetime.update(current_date, integrator.total)
+            if self.statistics_importer is not None:
+                hourly.add(timestamp, block.current_power, integrator.total)
+                if hourly.completed:
+                    rows, hourly.completed = hourly.completed, []
+                    if serial is None:
+                        serial_number, name = data.serial_number, f"Zeversolar {data.serial_number}"
+                    else:
+                        serial_number, name = serial, f"Zeversolar Inverter {serial}"
+                    self.hass.async_create_task(
+                        self.statistics_importer.async_import(serial_number, name, rows)
+                    )
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    def _adapt_poll_interval(self, data):
+        """Pick the next poll interval from production state and sun position.
+
+        Polling drops to the maximum interval at night or when the inverter
+        produces nothing, and speeds up towards the minimum interval as the
+        power ramp approaches the configured threshold (W per minute).
+        """
+        now = self.hass.loop.time()
+        power = data.current_power
+
+        if not power or data.inverter_status == "Offline" or not sun.is_up(self.hass):
+            interval = self.max_scan_interval
+        else:
+            interval = self.scan_interval
+            if self._last_power is not None and now > self._last_power_time:
+                ramp = abs(power - self._last_power) / (now - self._last_power_time) * 60
+                ratio = min(1.0, ramp / self.ramp_threshold)
+                interval -= (self.scan_interval - self.min_scan_interval) * ratio
+            # Ease back to the normal rate instead of jumping straight to it
+            interval = min(interval, self.poll_interval.total_seconds() * 2)
+
+        self._last_power = power
+        self._last_power_time = now
+        interval = max(self.min_scan_interval, min(self.max_scan_interval, interval))
+        if interval != self.poll_interval.total_seconds():
+            _LOGGER.debug("Next Zeversolar poll of %s in %.0f s", self.url, interval)
+            self.poll_interval = timedelta(seconds=interval)
+
+    async def _async_get_data(self):
+        """Fetch live data, falling back to an offline snapshot."""
+        now = self.hass.loop.time()
+        if not self.breaker.allow_request(now):
+            return self._offline_data()
+
+        try:
+            data = await self.async_fetch_data(
+                probe=self.breaker.probing, deadline=now + self.update_deadline
+            )
+        except ZeversolarError as error:
+            if self.breaker.record_failure(now):
+                _LOGGER.warning(
+                    "Zeversolar at %s is unreachable, retrying at %s: %s",
+                    self.url,
+                    self.breaker.next_probe,
+                    error,
+                )
             else:
-                # Return minimal data structure with offline status
-                return {
-                    "serial_number": "unknown",
-                    "registry_key": "unknown",
-                    "hardware_version": "unknown",
-                    "software_version": "unknown",
-                    "time": datetime.now().strftime("%H:%M %d/%m/%Y"),
-                    "inverter_status": "Offline",
-                    "current_power": 0,
-                    "energy_today": 0,
-                    "inverter_serial": "unknown",
-                }
-
-    def fetch_data(self):
+                _LOGGER.debug("Error communicating with Zeversolar at %s: %s", self.url, error)
+            return self._offline_data()
+
+        self.metrics.last_success = dt_util.utcnow()
+        if self.breaker.record_success():
+            _LOGGER.info("Zeversolar at %s is reachable again", self.url)
+        return data
+
+    def _offline_data(self):
+        """Return the last known data marked offline."""
+        # Return last successful data if available, otherwise return offline status
+        if self.last_successful_data is not None:
+            return self.last_successful_data.as_offline()
+        return GatewaySnapshot.unknown(datetime.now().strftime("%H:%M %d/%m/%Y"))
+
+    @property
+    def update_deadline(self):
+        """Return the seconds one update may take at the current interval.
+
+        A response that arrives later than this would be stale by the time
+        the next poll is due.
+        """
+        budget = UPDATE_DEADLINE_FRACTION * self.poll_interval.total_seconds()
+        return max(PROBE_TIMEOUT, min(MAX_UPDATE_DEADLINE, budget))
+
+    async def async_fetch_data(self, probe=False, deadline=None):
         """Fetch data from Zeversolar."""
+        start = self.hass.loop.time()
+        received = self.client.bytes_received
         try:
-            response = requests.get(f"{self.url}/home.cgi", timeout=10)
-            response.raise_for_status()
-            
-            data = response.text.strip().split("\n")
-            
-            # Parse the data based on the format we observed
-            result = {
-                "wifi_enabled": data[0],
-                "display_mode": data[1],
-                "serial_number": data[2],
-                "registry_key": data[3],
-                "hardware_version": data[4],
-                "software_version": data[5],
-                "time": data[6],
-                "cloud_status": data[7],
-                "inverter_count": data[8],
-                "inverter_status": "Online",
-            }
-            
-            # Parse inverter data if available
-            if int(data[8]) > 0:
-                inverter_index = 9
-                result["inverter_serial"] = data[inverter_index]
-                result["current_power"] = int(data[inverter_index + 1])
-                result["energy_today"] = float(data[inverter_index + 2])
-                if data[inverter_index + 3] == "OK":
-                    result["inverter_status"] = "Online"
-                else:
-                    result["inverter_status"] = data[inverter_index + 3]
-            else:
-                # No inverter data available
-                result["inverter_serial"] = "unknown"
-                result["current_power"] = 0
-                result["energy_today"] = 0
-                result["inverter_status"] = "No Data"
-            
-            # Store successful data for future use if connection fails
-            self.last_successful_data = result.copy()
-            
-            return result
-        except requests.RequestException as error:
-            _LOGGER.error("Error fetching data from Zeversolar: %s", error)
-            # Re-raise the exception to be handled by _async_update_data
+            body = await self.client.async_get_home(probe=probe, deadline=deadline)
+        except ZeversolarError as error:
+            self.metrics.record_error(error)
+            raise
+        self.metrics.record_request(
+            self.hass.loop.time() - start, self.client.bytes_received - received
+        )
+
+        # The body includes the stick's own clock, so an identical body means
+        # the stick has not refreshed its values since the last poll.
+        if body == self._last_body and self.data is self.last_successful_data:
+            if (
+                not self.heartbeat_interval
+                or self.hass.loop.time() - self._last_delivery < self.heartbeat_interval
+            ):
+                self._skip_listeners = True
+            return self.last_successful_data
+
+        parse_start = time.perf_counter()
+        try:
+            result = parse_home(body)
+        except ZeversolarError as error:
+            self.metrics.record_error(error)
             raise
+        self.metrics.record_parse(time.perf_counter() - parse_start)
+        self._last_body = body
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+        self._record_history(result)
+
+        # Store successful data for future use if connection fails
+        self.last_successful_data = result
+        return result
+
+    def _record_history(self, snapshot):
+        """Append a new live snapshot to the in-memory sample buffers."""
+        timestamp = time.time()
+        if self.clock.observe(snapshot.time, timestamp) and self._unsub_rollover is not None:
+            _LOGGER.debug(
+                "Zeversolar at %s clock drift %.0f s, rescheduling the rollover",
+                self.url,
+                self.clock.drift,
+            )
+            self.async_schedule_rollover()
+        current_date = self.day
+        history = self.history
+        if None not in history:
+            history[None] = PowerHistory()
+        history[None].add(timestamp, snapshot.current_power, snapshot.energy_today, current_date)
+
+        # Per-inverter buffers only exist for the per-inverter sensors
+        inverters = snapshot.inverters if len(snapshot.inverters) > 1 else {}
+        if len(history) != len(inverters) + 1:
+            for serial in [serial for serial in history if serial is not None and serial not in inverters]:
+                del history[serial]
+        for serial, inverter in inverters.items():
+            buffer = history.get(serial)
+            if buffer is None:
+                buffer = history[serial] = PowerHistory()
+            buffer.add(timestamp, inverter.current_power, inverter.energy_today, current_date)
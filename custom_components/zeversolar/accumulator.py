@@ -0,0 +1,93 @@
+"""Daily energy accumulator behind the Energy Today Total sensor."""
+from datetime import date
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# A drop of more than this many kWh is treated as an inverter reset rather
+# than noise in the reported value.
+RESET_THRESHOLD = 0.5
+
+
+class DailyEnergyAccumulator:
+    """Turn the stick's energy_today reading into a never-decreasing daily total.
+
+    ``update`` must be called exactly once per new sample; reading ``total``
+    is free and has no side effects.
+    """
+
+    __slots__ = ("previous_energy_today", "total", "last_reset_date")
+
+    def __init__(self):
+        """Initialize."""
+        self.previous_energy_today = None
+        self.total = 0
+        self.last_reset_date = None
+
+    def as_dict(self):
+        """Return the state to persist across restarts."""
+        return {
+            "previous_energy_today": self.previous_energy_today,
+            "total": self.total,
+            "last_reset_date": self.last_reset_date.isoformat() if self.last_reset_date else None,
+        }
+
+    def restore(self, data):
+        """Restore the state saved by as_dict."""
+        try:
+            self.previous_energy_today = data["previous_energy_today"]
+            self.total = data["total"]
+            self.last_reset_date = (
+                date.fromisoformat(data["last_reset_date"]) if data["last_reset_date"] else None
+            )
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.warning("Ignoring stored energy accumulator state: %s", error)
+            self.previous_energy_today = None
+            self.total = 0
+            self.last_reset_date = None
+
+    def update(self, current_value, inverter_status, current_date):
+        """Fold one energy_today sample into the total and return it."""
+        # First reading ever
+        if self.previous_energy_today is None:
+            self.previous_energy_today = current_value
+            self.last_reset_date = current_date
+            self.total = current_value
+            return self.total
+
+        # Check for date change (midnight reset)
+        if self.last_reset_date != current_date:
+            _LOGGER.info(
+                "Daily date change detected: previous_date=%s, current_date=%s",
+                self.last_reset_date,
+                current_date,
+            )
+            # It's a new day, start counting from the current value
+            self.last_reset_date = current_date
+            self.total = current_value
+            self.previous_energy_today = current_value
+            return self.total
+
+        # Check for inverter reset
+        # This happens when the current value is much lower than the previous value
+        # and the inverter just came back online after being offline or reset at midnight
+        if (
+            current_value < self.previous_energy_today
+            and (self.previous_energy_today - current_value) > RESET_THRESHOLD
+        ):
+            _LOGGER.info(
+                "Inverter reset detected: previous=%s, current=%s, status=%s",
+                self.previous_energy_today,
+                current_value,
+                inverter_status,
+            )
+            # Start accumulating from the current value without adding the
+            # negative delta to the total
+            self.total = current_value
+        elif current_value > self.previous_energy_today:
+            # Normal operation - only add positive changes
+            self.total += current_value - self.previous_energy_today
+
+        # Update previous value for next time
+        self.previous_energy_today = current_value
+        return self.total
@@ -0,0 +1,330 @@
+"""Async HTTP transport for Zeversolar Wi-Fi sticks."""
+import asyncio
+from collections import deque
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .const import (
+    DATA_REQUEST_BUDGET,
+    DATA_SINGLE_FLIGHT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DOMAIN,
+    HOST_BURST,
+    HOST_MAX_CONCURRENT,
+    HOST_QUEUE_TIMEOUT,
+    HOST_RATE,
+    PROBE_TIMEOUT,
+)
+
+
+class ZeversolarError(Exception):
+    """Base error for Zeversolar communication."""
+
+
+class ZeversolarConnectionError(ZeversolarError):
+    """Error raised when the stick cannot be reached or answers badly."""
+
+
+class ZeversolarTimeoutError(ZeversolarConnectionError):
+    """Error raised when the stick does not answer in time."""
+
+
+class ZeversolarHttpError(ZeversolarConnectionError):
+    """Error raised when the stick answers with an HTTP error status."""
+
+
+class ZeversolarDeadlineError(ZeversolarTimeoutError):
+    """Error raised when a fetch did not finish before its deadline."""
+
+
+class ZeversolarBusyError(ZeversolarError):
+    """Error raised when a request found no free slot for its stick in time."""
+
+
+class SingleFlight:
+    """Let concurrent callers with the same key share one in-flight call.
+
+    The first caller starts the call; everyone arriving before it finishes
+    awaits the same result or exception. A caller that is cancelled does not
+    cancel the shared call for the others.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self._calls = {}
+        self.shared = 0
+
+    async def async_do(self, key, func):
+        """Return the result of func(), or of the call already running for key."""
+        future = self._calls.get(key)
+        if future is None:
+            future = self._calls[key] = asyncio.ensure_future(func())
+            future.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(future)
+
+    def _finished(self, key, future):
+        """Forget a finished call."""
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled
+            future.exception()
+
+
+def get_single_flight(hass):
+    """Return the SingleFlight shared by everything talking to the sticks."""
+    data = hass.data.setdefault(DOMAIN, {})
+    single_flight = data.get(DATA_SINGLE_FLIGHT)
+    if single_flight is None:
+        single_flight = data[DATA_SINGLE_FLIGHT] = SingleFlight()
+    return single_flight
+
+
+class HostLimiter:
+    """Token bucket and concurrency limit for the requests to one host.
+
+    At most ``max_concurrent`` requests run at once and, after an initial
+    burst of ``burst``, no more than ``rate`` start per second. Callers over
+    the budget wait in FIFO order until their deadline.
+    """
+
+    __slots__ = ("rate", "burst", "max_concurrent", "_tokens", "_updated", "_active", "_waiters", "_timer")
+
+    def __init__(self, rate=HOST_RATE, burst=HOST_BURST, max_concurrent=HOST_MAX_CONCURRENT):
+        """Initialize."""
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self._tokens = float(burst)
+        self._updated = None
+        self._active = 0
+        self._waiters = deque()
+        self._timer = None
+
+    @property
+    def idle(self):
+        """Return True if nothing is running or waiting."""
+        return not self._active and not self._waiters
+
+    @property
+    def queued(self):
+        """Return the number of waiting callers."""
+        return len(self._waiters)
+
+    async def async_acquire(self, deadline, host):
+        """Wait for a slot until deadline (loop time)."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self._dispatch()
+        if waiter.done():
+            return
+
+        def expire():
+            if not waiter.done():
+                waiter.set_exception(
+                    ZeversolarBusyError(f"No request slot for {host} before the deadline")
+                )
+
+        handle = loop.call_at(deadline, expire)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # Granted just as the caller was cancelled
+                self.release()
+            raise
+        finally:
+            handle.cancel()
+
+    def release(self):
+        """Give back the slot of a finished request."""
+        self._active -= 1
+        self._dispatch()
+
+    def _refill(self, now):
+        """Add the tokens earned since the last refill."""
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _dispatch(self):
+        """Grant slots to waiting callers in order while the budget allows."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._refill(now)
+        waiters = self._waiters
+        while waiters and self._active < self.max_concurrent:
+            waiter = waiters[0]
+            if waiter.done():
+                # Expired or cancelled while queued
+                waiters.popleft()
+                continue
+            if self._tokens < 1:
+                if self._timer is None:
+                    self._timer = loop.call_at(
+                        now + (1 - self._tokens) / self.rate, self._on_timer
+                    )
+                return
+            waiters.popleft()
+            self._tokens -= 1
+            self._active += 1
+            waiter.set_result(None)
+
+    def _on_timer(self):
+        """Retry waiting callers once a token is available."""
+        self._timer = None
+        self._dispatch()
+
+
+class RequestBudget:
+    """Per-host limiters shared by everything talking to the sticks."""
+
+    # Limiters of idle hosts are dropped past this many (network scans)
+    MAX_IDLE_HOSTS = 64
+
+    def __init__(self, rate=HOST_RATE, burst=HOST_BURST, max_concurrent=HOST_MAX_CONCURRENT):
+        """Initialize."""
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self._limiters = {}
+        self.queued = 0
+        self.rejected = 0
+
+    async def async_acquire(self, host, deadline):
+        """Wait for a slot on host and return its limiter."""
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            if len(self._limiters) >= self.MAX_IDLE_HOSTS:
+                for idle in [key for key, value in self._limiters.items() if value.idle]:
+                    del self._limiters[idle]
+            limiter = self._limiters[host] = HostLimiter(
+                self.rate, self.burst, self.max_concurrent
+            )
+        if limiter.queued or not limiter.idle:
+            self.queued += 1
+        try:
+            await limiter.async_acquire(deadline, host)
+        except ZeversolarBusyError:
+            self.rejected += 1
+            raise
+        return limiter
+
+    def as_dict(self):
+        """Return the budget settings and counters for diagnostics."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_concurrent": self.max_concurrent,
+            "queued": self.queued,
+            "rejected": self.rejected,
+        }
+
+
+def get_request_budget(hass):
+    """Return the RequestBudget shared by everything talking to the sticks."""
+    data = hass.data.setdefault(DOMAIN, {})
+    budget = data.get(DATA_REQUEST_BUDGET)
+    if budget is None:
+        budget = data[DATA_REQUEST_BUDGET] = RequestBudget()
+    return budget
+
+
+class ZeversolarClient:
+    """Fetch home.cgi from a Zeversolar stick over a shared client session.
+
+    The session is owned by the caller (normally Home Assistant's pooled
+    session), so connections are kept alive between polls whenever the
+    stick's HTTP server allows it. Clients given the same SingleFlight send
+    at most one request at a time per stick; concurrent fetches share it.
+    Clients given the same RequestBudget queue for the per-host limit
+    instead of piling requests onto the stick.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        single_flight: SingleFlight = None,
+        budget: RequestBudget = None,
+    ):
+        """Initialize."""
+        self.url = url.rstrip("/")
+        self._session = session
+        self._single_flight = single_flight
+        self._budget = budget
+        self._host = urlsplit(self.url).netloc.lower()
+        self._timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self._probe_timeout = aiohttp.ClientTimeout(total=PROBE_TIMEOUT)
+        # Raw bytes of the responses this client received itself; a fetch
+        # that joined another client's request adds nothing.
+        self.bytes_received = 0
+
+    async def async_get_home(self, probe: bool = False, deadline: float = None) -> str:
+        """Return the raw home.cgi body.
+
+        A probe uses a short total timeout so checking an unreachable stick
+        is cheap. deadline (loop time) bounds the whole fetch, including the
+        wait for a request slot.
+        """
+        if deadline is None:
+            return await self._async_get_home(probe)
+        remaining = deadline - asyncio.get_running_loop().time()
+        try:
+            return await asyncio.wait_for(self._async_get_home(probe), max(0.0, remaining))
+        except asyncio.TimeoutError as error:
+            raise ZeversolarDeadlineError(
+                f"{self.url}/home.cgi did not answer within {remaining:.1f} s"
+            ) from error
+
+    async def _async_get_home(self, probe):
+        """Return the body, sharing a request already in flight."""
+        if self._single_flight is None:
+            return await self._async_fetch_home(probe)
+        return await self._single_flight.async_do(
+            self.url.lower(), lambda: self._async_fetch_home(probe)
+        )
+
+    async def _async_fetch_home(self, probe):
+        """Send the request for home.cgi within the host's budget."""
+        if self._budget is None:
+            return await self._async_request_home(probe)
+        deadline = asyncio.get_running_loop().time() + (
+            PROBE_TIMEOUT if probe else HOST_QUEUE_TIMEOUT
+        )
+        limiter = await self._budget.async_acquire(self._host, deadline)
+        try:
+            return await self._async_request_home(probe)
+        finally:
+            limiter.release()
+
+    async def _async_request_home(self, probe):
+        """Send the request for home.cgi."""
+        timeout = self._probe_timeout if probe else self._timeout
+        try:
+            async with self._session.get(f"{self.url}/home.cgi", timeout=timeout) as response:
+                response.raise_for_status()
+                raw = await response.read()
+                self.bytes_received += len(raw)
+                return raw.decode(response.get_encoding(), errors="replace")
+        except asyncio.TimeoutError as error:
+            raise ZeversolarTimeoutError(
+                f"Timeout while fetching {self.url}/home.cgi"
+            ) from error
+        except aiohttp.ClientResponseError as error:
+            raise ZeversolarHttpError(
+                f"HTTP {error.status} from {self.url}/home.cgi"
+            ) from error
+        except aiohttp.ClientError as error:
+            raise ZeversolarConnectionError(
+                f"Error fetching {self.url}/home.cgi: {error}"
+            ) from error
@@ -0,0 +1,85 @@
+"""Circuit breaker for Zeversolar sticks that stop answering."""
+from datetime import timedelta
+import random
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_BASE_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Track consecutive failures of one device and back off exponentially.
+
+    After ``failure_threshold`` failures in a row the breaker opens. While
+    open, requests are refused until the backoff expires; the next request
+    is then a single probe. A failed probe reopens the breaker with double
+    the backoff, a successful one closes it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=BREAKER_FAILURE_THRESHOLD,
+        base_backoff=BREAKER_BASE_BACKOFF,
+        max_backoff=BREAKER_MAX_BACKOFF,
+    ):
+        """Initialize."""
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.next_probe = None
+        self._next_probe_time = 0.0
+
+    @property
+    def probing(self):
+        """Return True if the next request is a recovery probe."""
+        return self.state == STATE_HALF_OPEN
+
+    def allow_request(self, now):
+        """Return True if a request may be sent at monotonic time now."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and now >= self._next_probe_time:
+            self.state = STATE_HALF_OPEN
+        return self.state == STATE_HALF_OPEN
+
+    def record_success(self):
+        """Close the breaker. Return True if the device just recovered."""
+        recovered = self.state != STATE_CLOSED
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.next_probe = None
+        return recovered
+
+    def record_failure(self, now):
+        """Count a failure. Return True if the breaker just opened."""
+        self.failures += 1
+        if self.state == STATE_CLOSED and self.failures < self.failure_threshold:
+            return False
+
+        opened = self.state == STATE_CLOSED
+        exponent = self.failures - self.failure_threshold
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** min(exponent, 16))
+        # Equal jitter keeps a fleet of dead sticks from probing in lockstep
+        backoff = random.uniform(backoff / 2, backoff)
+        self.state = STATE_OPEN
+        self._next_probe_time = now + backoff
+        self.next_probe = dt_util.utcnow() + timedelta(seconds=backoff)
+        return opened
+
+    def as_dict(self):
+        """Return the breaker state for attributes and diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "next_probe": self.next_probe.isoformat() if self.next_probe else None,
+        }
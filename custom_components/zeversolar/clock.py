@@ -0,0 +1,115 @@
+"""Offset of the stick's clock and the device day it implies."""
+from datetime import datetime, timedelta
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# The stick reports its local time truncated to the minute
+CLOCK_RESOLUTION = 60
+
+# Readings this far outside the current estimate mean the clock was set;
+# closer ones are put down to request latency.
+CLOCK_TOLERANCE = 5
+
+# A stick this far off has never had its clock set; the host day is used
+# for the rollover instead.
+MAX_CLOCK_DRIFT = 12 * 3600
+
+
+def parse_device_time(text, time_zone):
+    """Return the "HH:MM DD/MM/YYYY" time of the stick in time_zone, or None."""
+    try:
+        clock, day = text.split(" ", 1)
+        hour, minute = clock.split(":")
+        day, month, year = day.split("/")
+        return datetime(int(year), int(month), int(day), int(hour), int(minute), tzinfo=time_zone)
+    except (AttributeError, ValueError):
+        return None
+
+
+class DeviceClock:
+    """Estimate how far the stick's clock runs ahead of the host clock.
+
+    Each reading bounds the offset to one CLOCK_RESOLUTION interval.
+    Intersecting the intervals of successive readings narrows the estimate
+    to a few seconds. A reading more than CLOCK_TOLERANCE outside the
+    estimate means the stick's clock was set, and the estimate starts over
+    from that reading.
+    """
+
+    __slots__ = ("time_zone", "lower", "upper", "_last_text", "_last_device_time", "resets")
+
+    def __init__(self, time_zone):
+        """Initialize with the time zone the stick's local time is in."""
+        self.time_zone = time_zone
+        self.lower = None
+        self.upper = None
+        self._last_text = None
+        self._last_device_time = None
+        self.resets = 0
+
+    @property
+    def drift(self):
+        """Return the seconds the stick is ahead of the host, or None."""
+        if self.lower is None:
+            return None
+        return (self.lower + self.upper) / 2
+
+    @property
+    def offset(self):
+        """Return the offset used to map device days onto host time."""
+        drift = self.drift
+        if drift is None or abs(drift) > MAX_CLOCK_DRIFT:
+            return 0.0
+        return drift
+
+    def observe(self, text, timestamp):
+        """Fold in the stick's time as received at timestamp (epoch seconds).
+
+        Return True if the offset used for the rollover moved by a second
+        or more.
+        """
+        # The same minute read again still narrows the upper bound; only
+        # the parsing is skipped.
+        if text != self._last_text:
+            self._last_text = text
+            device_time = parse_device_time(text, self.time_zone)
+            self._last_device_time = device_time.timestamp() if device_time is not None else None
+        if self._last_device_time is None:
+            return False
+
+        previous = self.offset
+        lower = self._last_device_time - timestamp
+        upper = lower + CLOCK_RESOLUTION
+        if self.lower is None:
+            self.lower, self.upper = lower, upper
+        elif lower > self.upper + CLOCK_TOLERANCE or upper < self.lower - CLOCK_TOLERANCE:
+            _LOGGER.info(
+                "Zeversolar clock was set: drift %.0f s -> %.0f s", self.drift, lower + CLOCK_RESOLUTION / 2
+            )
+            self.resets += 1
+            self.lower, self.upper = lower, upper
+        else:
+            lower = max(self.lower, lower)
+            upper = min(self.upper, upper)
+            if lower > upper:
+                lower = upper = (lower + upper) / 2
+            self.lower, self.upper = lower, upper
+        return abs(self.offset - previous) >= 1
+
+    def day_at(self, timestamp):
+        """Return the stick's date at timestamp (host epoch seconds)."""
+        return datetime.fromtimestamp(timestamp + self.offset, self.time_zone).date()
+
+    def rollover_time(self, day):
+        """Return the host epoch seconds at which the stick's day after day starts."""
+        midnight = datetime.combine(day + timedelta(days=1), datetime.min.time(), self.time_zone)
+        return midnight.timestamp() - self.offset
+
+    def as_dict(self):
+        """Return the estimate for diagnostics."""
+        return {
+            "drift": self.drift,
+            "uncertainty": self.upper - self.lower if self.lower is not None else None,
+            "resets": self.resets,
+        }
@@ -6,13 +6,37 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
-import requests
 
+from .api import ZeversolarClient, ZeversolarError, get_request_budget, get_single_flight
+from .discovery import async_discover
+from .integrator import GAP_POLICIES
+from .parser import ZeversolarParseError, parse_home
 from .const import (
     DOMAIN,
+    DATA_VALIDATED,
     CONF_URL,
+    CONF_SCAN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_RAMP_THRESHOLD,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_SAMPLE_INTERVAL,
+    CONF_GAP_POLICY,
+    CONF_EXTERNAL_STATISTICS,
+    CONF_NETWORK,
+    CONF_EXPECTED_DEVICES,
+    CONF_DEVICES,
     DEFAULT_URL,
     DEFAULT_NAME,
+    DEFAULT_NETWORK,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_RAMP_THRESHOLD,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_GAP_POLICY,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,18 +48,21 @@ async def validate_input(hass: HomeAssistant, data):
 
     # Validate that we can connect to the Zeversolar device
     try:
-        response = await hass.async_add_executor_job(
-            lambda: requests.get(f"{url}/home.cgi", timeout=10)
+        client = ZeversolarClient(
+            async_get_clientsession(hass),
+            url,
+            single_flight=get_single_flight(hass),
+            budget=get_request_budget(hass),
         )
-        response.raise_for_status()
-        
+        body = await client.async_get_home()
+
         # Check if the response contains expected data
-        data = response.text.strip().split("\n")
-        if len(data) < 9:
-            return {"error": "invalid_data", "warning": "Invalid data received from Zeversolar device"}
-            
-        return {"title": DEFAULT_NAME}
-    except requests.RequestException as error:
+        snapshot = parse_home(body)
+
+        return {"title": DEFAULT_NAME, "body": body, "snapshot": snapshot}
+    except ZeversolarParseError:
+        return {"error": "invalid_data", "warning": "Invalid data received from Zeversolar device"}
+    except ZeversolarError as error:
         _LOGGER.warning("Error connecting to Zeversolar: %s", error)
         # Return a warning but allow setup to continue
         return {
@@ -50,8 +77,21 @@ class ZeversolarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
 
+    def __init__(self):
+        """Initialize."""
+        self._discovered = {}
+
+    def _stash_validated(self, url, body, snapshot):
+        """Let the new entry start from this response instead of fetching it again."""
+        validated = self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_VALIDATED, {})
+        validated[url] = (self.hass.loop.time(), body, snapshot)
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "discover"])
+
+    async def async_step_manual(self, user_input=None):
+        """Handle a device entered by URL."""
         errors = {}
         warning = None
 
@@ -61,7 +101,13 @@ class ZeversolarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 # If there's a warning, show it but continue with setup
                 if "warning" in info:
                     warning = info["warning"]
-                
+
+                if "snapshot" in info:
+                    # One entry per stick, whatever address it is reached at
+                    await self.async_set_unique_id(info["snapshot"].serial_number)
+                    self._abort_if_unique_id_configured()
+                    self._stash_validated(user_input[CONF_URL], info["body"], info["snapshot"])
+
                 return self.async_create_entry(title=info["title"], data=user_input)
             
             errors["base"] = info["error"]
@@ -69,7 +115,7 @@ class ZeversolarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 warning = info["warning"]
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_URL, default=DEFAULT_URL): str,
@@ -79,6 +125,96 @@ class ZeversolarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders={"warning": warning} if warning else None,
         )
 
+    async def async_step_discover(self, user_input=None):
+        """Scan a subnet for Zeversolar sticks."""
+        errors = {}
+
+        if user_input is not None:
+            try:
+                devices = await async_discover(
+                    async_get_clientsession(self.hass),
+                    user_input[CONF_NETWORK],
+                    max_results=user_input[CONF_EXPECTED_DEVICES],
+                    single_flight=get_single_flight(self.hass),
+                    budget=get_request_budget(self.hass),
+                )
+            except ValueError:
+                errors["base"] = "invalid_network"
+            else:
+                configured = set()
+                for entry in self._async_current_entries():
+                    configured.add(entry.data.get(CONF_URL))
+                    configured.add(entry.options.get(CONF_URL))
+                    configured.add(entry.unique_id)
+                # A stick answering on several addresses is listed once
+                self._discovered = {}
+                for device in devices:
+                    serial_number = device.snapshot.serial_number
+                    if device.url in configured or serial_number in configured:
+                        continue
+                    configured.add(serial_number)
+                    self._discovered[device.url] = device
+                if self._discovered:
+                    return await self.async_step_pick()
+                errors["base"] = "no_devices_found"
+
+        return self.async_show_form(
+            step_id="discover",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NETWORK, default=DEFAULT_NETWORK): str,
+                    vol.Required(CONF_EXPECTED_DEVICES, default=0): vol.All(
+                        vol.Coerce(int), vol.Range(min=0)
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_pick(self, user_input=None):
+        """Let the user pick which discovered sticks to add."""
+        if user_input is not None and user_input[CONF_DEVICES]:
+            urls = user_input[CONF_DEVICES]
+            for url in urls:
+                device = self._discovered[url]
+                self._stash_validated(url, device.body, device.snapshot)
+            # A flow creates one entry; every further device gets its own flow
+            for url in urls[1:]:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_IMPORT},
+                        data={CONF_URL: url},
+                    )
+                )
+            return await self.async_step_import({CONF_URL: urls[0]})
+
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_DEVICES, default=list(self._discovered)): cv.multi_select(
+                        {
+                            url: f"{device.snapshot.serial_number} ({url})"
+                            for url, device in self._discovered.items()
+                        }
+                    ),
+                }
+            ),
+        )
+
+    async def async_step_import(self, import_data):
+        """Create an entry for a device found by discovery."""
+        url = import_data[CONF_URL]
+        title = DEFAULT_NAME
+        validated = self.hass.data.get(DOMAIN, {}).get(DATA_VALIDATED, {}).get(url)
+        if validated is not None:
+            serial_number = validated[2].serial_number
+            await self.async_set_unique_id(serial_number)
+            self._abort_if_unique_id_configured()
+            title = f"{DEFAULT_NAME} {serial_number}"
+        return self.async_create_entry(title=title, data={CONF_URL: url})
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -95,17 +231,71 @@ class ZeversolarOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
+        errors = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if not (
+                user_input[CONF_MIN_SCAN_INTERVAL]
+                <= user_input[CONF_SCAN_INTERVAL]
+                <= user_input[CONF_MAX_SCAN_INTERVAL]
+            ):
+                errors["base"] = "invalid_intervals"
+            elif (
+                user_input[CONF_SAMPLE_INTERVAL]
+                and user_input[CONF_SAMPLE_INTERVAL] >= user_input[CONF_SCAN_INTERVAL]
+            ):
+                errors["base"] = "invalid_sample_interval"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Required(
                         CONF_URL,
-                        default=self.config_entry.data.get(CONF_URL, DEFAULT_URL),
+                        default=options.get(
+                            CONF_URL, self.config_entry.data.get(CONF_URL, DEFAULT_URL)
+                        ),
                     ): str,
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Required(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(CONF_ADAPTIVE_POLLING, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_MIN_SCAN_INTERVAL,
+                        default=options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Required(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Required(
+                        CONF_RAMP_THRESHOLD,
+                        default=options.get(CONF_RAMP_THRESHOLD, DEFAULT_RAMP_THRESHOLD),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_HEARTBEAT_INTERVAL,
+                        default=options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Required(
+                        CONF_SAMPLE_INTERVAL,
+                        default=options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_GAP_POLICY,
+                        default=options.get(CONF_GAP_POLICY, DEFAULT_GAP_POLICY),
+                    ): vol.In(GAP_POLICIES),
+                    vol.Required(
+                        CONF_EXTERNAL_STATISTICS,
+                        default=options.get(CONF_EXTERNAL_STATISTICS, False),
+                    ): bool,
                 }
             ),
+            errors=errors,
         )
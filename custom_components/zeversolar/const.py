@@ -4,9 +4,62 @@ DOMAIN = "zeversolar"
 
 # Configuration
 CONF_URL = "url"
+CONF_SCAN_INTERVAL = "scan_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_RAMP_THRESHOLD = "ramp_threshold"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+CONF_SAMPLE_INTERVAL = "sample_interval"
+CONF_GAP_POLICY = "gap_policy"
+CONF_EXTERNAL_STATISTICS = "external_statistics"
+CONF_NETWORK = "network"
+CONF_EXPECTED_DEVICES = "expected_devices"
+CONF_DEVICES = "devices"
 DEFAULT_URL = "http://zeverinverter.example.com"
 DEFAULT_NAME = "Zeversolar"
+DEFAULT_NETWORK = "192.168.1.0/24"
 DEFAULT_SCAN_INTERVAL = 60  # seconds
+DEFAULT_MIN_SCAN_INTERVAL = 15  # seconds, adaptive polling during fast ramps
+DEFAULT_MAX_SCAN_INTERVAL = 600  # seconds, adaptive polling at night
+DEFAULT_RAMP_THRESHOLD = 500  # W per minute at which polling reaches the minimum
+DEFAULT_HEARTBEAT_INTERVAL = 0  # minutes between writes of unchanged data, 0 = never
+DEFAULT_SAMPLE_INTERVAL = 0  # seconds between internal samples, 0 = publish every poll
+DEFAULT_GAP_POLICY = "skip"  # see integrator.GAP_POLICIES
+DEFAULT_CONNECT_TIMEOUT = 5  # seconds
+DEFAULT_READ_TIMEOUT = 10  # seconds
+PROBE_TIMEOUT = 2  # seconds, recovery probe of an unreachable stick
+DEFAULT_MAX_CONCURRENT_POLLS = 8
+POLL_JITTER = 1.0  # seconds of random spread added to each entry's phase
+UPDATE_DEADLINE_FRACTION = 0.8  # share of the poll interval one update may take
+MAX_UPDATE_DEADLINE = 15  # seconds, connect plus read timeout
+
+# Request budget per stick, shared by polls, config flows and scans
+HOST_MAX_CONCURRENT = 1  # requests in flight per host
+HOST_RATE = 1.0  # requests per second per host after the burst
+HOST_BURST = 4  # requests a host may get back to back
+HOST_QUEUE_TIMEOUT = 30  # seconds a request may wait for its slot
+
+# Subnet discovery in the config flow
+DISCOVERY_MAX_CONCURRENT = 64  # probes in flight
+DISCOVERY_TIMEOUT = 1.5  # seconds per host
+DISCOVERY_MIN_PREFIX = 16  # largest network that may be scanned
+
+# Circuit breaker for unreachable sticks
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures before backing off
+BREAKER_BASE_BACKOFF = 30  # seconds
+BREAKER_MAX_BACKOFF = 900  # seconds
+
+# Persistent storage of the last snapshot
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60  # seconds, debounces writes of the stored snapshot
+
+# hass.data[DOMAIN] keys shared by all entries
+DATA_SCHEDULER = "scheduler"
+DATA_VALIDATED = "validated"  # config flow responses handed to new entries
+DATA_SINGLE_FLIGHT = "single_flight"  # in-flight home.cgi requests per URL
+DATA_REQUEST_BUDGET = "request_budget"  # per-host request limiters
+VALIDATED_MAX_AGE = 60  # seconds a config flow response may be reused
 
 # Attributes
 ATTR_SERIAL_NUMBER = "serial_number"
@@ -16,6 +69,8 @@ ATTR_HARDWARE_VERSION = "hardware_version"
 ATTR_SOFTWARE_VERSION = "software_version"
 ATTR_INVERTER_STATUS = "inverter_status"
 ATTR_LAST_UPDATED = "last_updated"
+ATTR_CONNECTION_STATE = "connection_state"
+ATTR_NEXT_PROBE = "next_probe"
 
 # Sensor types
 SENSOR_TYPES = {
@@ -40,4 +95,135 @@ SENSOR_TYPES = {
         "device_class": "energy",
         "state_class": "total_increasing",  # New sensor with total_increasing for energy dashboard
     },
+    "integrated_energy_today": {
+        "name": "Integrated Energy Today",
+        "unit": "kWh",
+        "icon": "mdi:solar-power",
+        "device_class": "energy",
+        "state_class": "total_increasing",  # Integrated from current_power, anchored to energy_today
+    },
+    "energy_this_month": {
+        "name": "Energy This Month",
+        "unit": "kWh",
+        "icon": "mdi:solar-power",
+        "device_class": "energy",
+        "state_class": "total_increasing",  # Starts over on the first day of the month
+    },
+    "energy_this_year": {
+        "name": "Energy This Year",
+        "unit": "kWh",
+        "icon": "mdi:solar-power",
+        "device_class": "energy",
+        "state_class": "total_increasing",  # Starts over on January 1
+    },
+    "lifetime_energy": {
+        "name": "Lifetime Energy",
+        "unit": "kWh",
+        "icon": "mdi:solar-power",
+        "device_class": "energy",
+        "state_class": "total_increasing",  # Since the integration was set up
+    },
+}
+
+# Optional diagnostic sensors, disabled by default
+DIAGNOSTIC_SENSOR_TYPES = {
+    "poll_latency": {
+        "name": "Poll Latency",
+        "unit": "ms",
+        "icon": "mdi:timer-outline",
+        "device_class": "duration",
+        "state_class": "measurement",
+    },
+    "poll_errors": {
+        "name": "Poll Errors",
+        "unit": None,
+        "icon": "mdi:alert-circle-outline",
+        "device_class": None,
+        "state_class": "total_increasing",
+    },
+    "skipped_ticks": {
+        "name": "Skipped Poll Ticks",
+        "unit": None,
+        "icon": "mdi:timer-alert-outline",
+        "device_class": None,
+        "state_class": "total_increasing",
+    },
+    "skipped_updates": {
+        "name": "Skipped Unchanged Updates",
+        "unit": None,
+        "icon": "mdi:debug-step-over",
+        "device_class": None,
+        "state_class": "total_increasing",
+    },
+    "clock_drift": {
+        "name": "Clock Drift",
+        "unit": "s",
+        "icon": "mdi:clock-alert-outline",
+        "device_class": "duration",
+        "state_class": "measurement",
+    },
+    "last_successful_poll": {
+        "name": "Last Successful Poll",
+        "unit": None,
+        "icon": "mdi:clock-check-outline",
+        "device_class": "timestamp",
+        "state_class": None,
+    },
+}
+
+# Optional rolling statistics from the in-memory sample buffer, disabled by default
+STATISTIC_SENSOR_TYPES = {
+    "power_mean": {
+        "name": "Average Power (5 min)",
+        "unit": "W",
+        "icon": "mdi:solar-power",
+        "device_class": "power",
+        "state_class": "measurement",
+    },
+    "power_min": {
+        "name": "Minimum Power (5 min)",
+        "unit": "W",
+        "icon": "mdi:solar-power",
+        "device_class": "power",
+        "state_class": "measurement",
+    },
+    "power_max": {
+        "name": "Maximum Power (5 min)",
+        "unit": "W",
+        "icon": "mdi:solar-power",
+        "device_class": "power",
+        "state_class": "measurement",
+    },
+    "peak_power_today": {
+        "name": "Peak Power Today",
+        "unit": "W",
+        "icon": "mdi:solar-power-variant",
+        "device_class": "power",
+        "state_class": "measurement",
+    },
+    "peak_power_time": {
+        "name": "Peak Power Time",
+        "unit": None,
+        "icon": "mdi:clock-star-four-points-outline",
+        "device_class": "timestamp",
+        "state_class": None,
+    },
+}
+
+# Aggregates of the published window when sampling faster than publishing
+SAMPLED_SENSOR_TYPES = {
+    "sampled_power_max": {
+        "name": "Maximum Sampled Power",
+        "unit": "W",
+        "icon": "mdi:solar-power-variant",
+        "device_class": "power",
+        "state_class": "measurement",
+    },
+    "sampled_energy": {
+        "name": "Sampled Window Energy",
+        "unit": "Wh",
+        "icon": "mdi:solar-power",
+        "device_class": "energy",
+        "state_class": None,
+    },
 }
@@ -0,0 +1,60 @@
+"""Diagnostics support for Zeversolar."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api import get_request_budget
+from .const import DOMAIN
+
+TO_REDACT = {"serial_number", "registry_key", "inverter_serial", "inverters"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    snapshot = coordinator.data
+
+    return {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "poll_interval": coordinator.poll_interval.total_seconds(),
+        "update_deadline": coordinator.update_deadline,
+        "sample_interval": coordinator.sample_interval,
+        "metrics": coordinator.metrics.as_dict(),
+        "scheduler": coordinator.poll_stats.as_dict(),
+        "breaker": coordinator.breaker.as_dict(),
+        "request_budget": get_request_budget(hass).as_dict(),
+        "clock": {
+            **coordinator.clock.as_dict(),
+            "day": coordinator.day.isoformat(),
+            "rollovers": coordinator.rollovers,
+        },
+        "updates": {
+            "delivered": coordinator.delivered_updates,
+            "skipped_unchanged": coordinator.skipped_updates,
+            "held_for_publishing": coordinator.held_updates,
+        },
+        "history": coordinator.history[None].as_dict() if None in coordinator.history else None,
+        "integrated_energy": _integrator_diagnostics(coordinator.integrators.get(None)),
+        "lifetime_energy": (
+            coordinator.lifetime[None].as_dict() if None in coordinator.lifetime else None
+        ),
+        "imported_statistics_hours": (
+            coordinator.statistics_importer.imported_hours
+            if coordinator.statistics_importer is not None
+            else None
+        ),
+        "inverter_count": snapshot.inverter_count if snapshot else None,
+        "data": async_redact_data(snapshot.as_dict(), TO_REDACT) if snapshot else None,
+    }
+
+
+def _integrator_diagnostics(integrator):
+    """Return the state and correction counts of an energy integrator."""
+    if integrator is None:
+        return None
+    return {
+        **integrator.as_dict(),
+        "gaps": integrator.gaps,
+        "anchors": integrator.anchors,
+        "clamps": integrator.clamps,
+    }
@@ -0,0 +1,79 @@
+"""Discovery of Zeversolar sticks on a local subnet."""
+import asyncio
+import ipaddress
+
+import aiohttp
+
+from .api import ZeversolarClient, ZeversolarError
+from .const import (
+    DISCOVERY_MAX_CONCURRENT,
+    DISCOVERY_MIN_PREFIX,
+    DISCOVERY_TIMEOUT,
+)
+from .parser import parse_home
+
+
+class DiscoveredDevice:
+    """A stick that answered a discovery probe."""
+
+    __slots__ = ("url", "body", "snapshot")
+
+    def __init__(self, url, body, snapshot):
+        """Initialize."""
+        self.url = url
+        self.body = body
+        self.snapshot = snapshot
+
+
+async def async_discover(
+    session: aiohttp.ClientSession,
+    network,
+    port=80,
+    max_concurrent=DISCOVERY_MAX_CONCURRENT,
+    timeout=DISCOVERY_TIMEOUT,
+    max_results=0,
+    single_flight=None,
+    budget=None,
+):
+    """Probe every host of an IPv4 network for home.cgi.
+
+    A fixed pool of workers pulls hosts from one iterator, so at most
+    ``max_concurrent`` probes are in flight and no task is created per host.
+    Scanning stops early once ``max_results`` devices were found (0 scans
+    the whole range). Probes join requests already in flight to the same
+    host through ``single_flight`` and respect the per-host ``budget``.
+    Raises ValueError for an invalid or too large network.
+    """
+    network = ipaddress.ip_network(network, strict=False)
+    if network.version != 4 or network.prefixlen < DISCOVERY_MIN_PREFIX:
+        raise ValueError(f"Network {network} is not an IPv4 range of /{DISCOVERY_MIN_PREFIX} or smaller")
+
+    hosts = iter(network.hosts() if network.num_addresses > 1 else [network.network_address])
+    found = []
+
+    async def probe(host):
+        url = f"http://{host}" if port == 80 else f"http://{host}:{port}"
+        client = ZeversolarClient(
+            session,
+            url,
+            connect_timeout=timeout,
+            read_timeout=timeout,
+            single_flight=single_flight,
+            budget=budget,
+        )
+        try:
+            body = await client.async_get_home()
+            snapshot = parse_home(body)
+        except ZeversolarError:
+            return
+        found.append(DiscoveredDevice(url, body, snapshot))
+
+    async def worker():
+        for host in hosts:
+            if max_results and len(found) >= max_results:
+                return
+            await probe(host)
+
+    await asyncio.gather(*(worker() for _ in range(max_concurrent)))
+    found.sort(key=lambda device: ipaddress.ip_address(device.url[7:].split(":")[0]))
+    return found
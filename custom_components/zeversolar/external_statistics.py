@@ -0,0 +1,175 @@
+"""Hourly energy and power statistics imported as external statistics."""
+import asyncio
+from datetime import datetime, timezone
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HourlyStatistics:
+    """Fold one inverter's samples into hourly energy and power rows.
+
+    Energy comes from the integrated energy total, so it includes what the
+    integrator anchored to the device counter. ``add`` is O(1); finished
+    hours are collected in ``completed`` until they are imported. The
+    running hour is persisted, so a restart does not lose what it produced
+    before Home Assistant stopped.
+    """
+
+    __slots__ = ("hour", "energy", "minimum", "maximum", "last_total", "completed")
+
+    def __init__(self, last_total=None):
+        """Initialize, continuing from an integrated total if known."""
+        self.hour = None
+        self.energy = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.last_total = last_total
+        self.completed = []
+
+    def as_dict(self):
+        """Return the running hour to persist across restarts."""
+        return {
+            "hour": self.hour,
+            "energy": self.energy,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "last_total": self.last_total,
+        }
+
+    def restore(self, data):
+        """Restore the running hour saved by as_dict."""
+        try:
+            self.hour = data["hour"]
+            self.energy = data["energy"]
+            self.minimum = data["minimum"]
+            self.maximum = data["maximum"]
+            self.last_total = data["last_total"]
+        except (KeyError, TypeError) as error:
+            _LOGGER.warning("Ignoring stored hourly statistics state: %s", error)
+            self._reset()
+
+    def _reset(self):
+        """Return to the state of a new instance."""
+        fresh = HourlyStatistics()
+        for name in self.__slots__:
+            setattr(self, name, getattr(fresh, name))
+
+    def add(self, timestamp, power, total):
+        """Fold in one sample with the integrated energy total in kWh."""
+        hour = int(timestamp // 3600) * 3600
+        if hour != self.hour:
+            if self.hour is not None and self.maximum is not None:
+                self.completed.append((self.hour, self.energy, self.minimum, self.maximum))
+            self.hour = hour
+            self.energy = 0.0
+            self.minimum = None
+            self.maximum = None
+
+        if self.last_total is not None:
+            delta = total - self.last_total
+            # The integrated total restarts from zero at midnight
+            self.energy += delta if delta >= 0 else total
+        self.last_total = total
+        if self.minimum is None or power < self.minimum:
+            self.minimum = power
+        if self.maximum is None or power > self.maximum:
+            self.maximum = power
+
+
+def statistic_ids(serial):
+    """Return the energy and power statistic IDs of a gateway or inverter."""
+    object_id = slugify(serial)
+    return f"{DOMAIN}:{object_id}_energy", f"{DOMAIN}:{object_id}_power"
+
+
+class ZeversolarStatisticsImporter:
+    """Push finished hours of one config entry to the recorder in batches.
+
+    The running energy sum continues from the last row in the database, so
+    restarts and reloads do not start the sum over.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize."""
+        self.hass = hass
+        self._lock = asyncio.Lock()
+        self._last = {}
+        self.imported_hours = 0
+
+    async def async_import(self, serial, name, rows):
+        """Import (hour, energy kWh, min W, max W) rows of one inverter."""
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Recorder not loaded, dropping %d hours of %s", len(rows), serial)
+            return
+        energy_id, power_id = statistic_ids(serial)
+        async with self._lock:
+            if energy_id not in self._last:
+                self._last[energy_id] = await self._async_get_last(energy_id)
+            last_hour, total = self._last[energy_id]
+
+            energy_rows = []
+            power_rows = []
+            for hour, energy, minimum, maximum in rows:
+                if last_hour is not None and hour <= last_hour:
+                    continue
+                start = datetime.fromtimestamp(hour, timezone.utc)
+                total += energy
+                energy_rows.append(StatisticData(start=start, state=total, sum=total))
+                # The mean over the hour follows from the energy it produced
+                mean = max(minimum, min(maximum, energy * 1000))
+                power_rows.append(StatisticData(start=start, mean=mean, min=minimum, max=maximum))
+                last_hour = hour
+            if not energy_rows:
+                return
+            self._last[energy_id] = (last_hour, total)
+
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{name} energy",
+                source=DOMAIN,
+                statistic_id=energy_id,
+                unit_of_measurement="kWh",
+            ),
+            energy_rows,
+        )
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{name} power",
+                source=DOMAIN,
+                statistic_id=power_id,
+                unit_of_measurement="W",
+            ),
+            power_rows,
+        )
+        self.imported_hours += len(energy_rows)
+
+    async def _async_get_last(self, statistic_id):
+        """Return the start (epoch seconds) and sum of the newest stored row."""
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+        )
+        if not last or not last.get(statistic_id):
+            return None, 0.0
+        row = last[statistic_id][0]
+        start = row["start"]
+        if isinstance(start, datetime):
+            start = start.timestamp()
+        return start, row["sum"] or 0.0
@@ -0,0 +1,219 @@
+"""In-memory buffers of recent power samples and their statistics."""
+from array import array
+from collections import deque
+
+# Rolling statistics cover this many seconds of samples
+HISTORY_WINDOW = 300
+
+# Samples kept per inverter; the oldest sample is dropped when full, even if
+# it is still inside the window.
+HISTORY_SIZE = 512
+
+
+class PowerHistory:
+    """Fixed-size, array-backed buffer of (timestamp, power, energy_today).
+
+    Rolling mean, minimum and maximum over the window are maintained as
+    samples come and go: a running sum for the mean and monotonic queues of
+    sample numbers for the extremes. Adding a sample is amortized O(1) and
+    reading a statistic is O(1); nothing is scanned or allocated per sample.
+    """
+
+    __slots__ = (
+        "capacity",
+        "window",
+        "_timestamps",
+        "_power",
+        "_energy",
+        "_first",
+        "_next",
+        "_sum",
+        "_max_queue",
+        "_min_queue",
+        "peak_today",
+        "peak_time",
+        "_peak_date",
+    )
+
+    def __init__(self, capacity=HISTORY_SIZE, window=HISTORY_WINDOW):
+        """Initialize."""
+        self.capacity = capacity
+        self.window = window
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._power = array("d", bytes(8 * capacity))
+        self._energy = array("d", bytes(8 * capacity))
+        # Sample numbers of the oldest sample and of the next one to write;
+        # sample n lives at index n % capacity.
+        self._first = 0
+        self._next = 0
+        self._sum = 0.0
+        self._max_queue = deque()
+        self._min_queue = deque()
+        self.peak_today = None
+        self.peak_time = None
+        self._peak_date = None
+
+    def __len__(self):
+        """Return the number of samples in the window."""
+        return self._next - self._first
+
+    def add(self, timestamp, power, energy_today, current_date):
+        """Append one sample taken at timestamp (seconds since the epoch)."""
+        capacity = self.capacity
+        timestamps = self._timestamps
+        cutoff = timestamp - self.window
+        while self._next > self._first and (
+            self._next - self._first == capacity
+            or timestamps[self._first % capacity] < cutoff
+        ):
+            self._evict()
+
+        number = self._next
+        index = number % capacity
+        timestamps[index] = timestamp
+        self._power[index] = power
+        self._energy[index] = energy_today
+        self._next = number + 1
+        self._sum += power
+
+        # Keep the earliest sample of equal extremes at the front, so the
+        # time at peak is when the peak was first reached.
+        values = self._power
+        max_queue = self._max_queue
+        while max_queue and values[max_queue[-1] % capacity] < power:
+            max_queue.pop()
+        max_queue.append(number)
+        min_queue = self._min_queue
+        while min_queue and values[min_queue[-1] % capacity] > power:
+            min_queue.pop()
+        min_queue.append(number)
+
+        if current_date != self._peak_date:
+            self._peak_date = current_date
+            self.peak_today = None
+        if self.peak_today is None or power > self.peak_today:
+            self.peak_today = power
+            self.peak_time = timestamp
+
+    def _evict(self):
+        """Drop the oldest sample."""
+        number = self._first
+        self._sum -= self._power[number % self.capacity]
+        if self._max_queue[0] == number:
+            self._max_queue.popleft()
+        if self._min_queue[0] == number:
+            self._min_queue.popleft()
+        self._first = number + 1
+        if self._first == self._next:
+            # Reset instead of carrying rounding errors into the next window
+            self._sum = 0.0
+
+    @property
+    def mean(self):
+        """Return the mean power over the window."""
+        count = self._next - self._first
+        return self._sum / count if count else None
+
+    @property
+    def maximum(self):
+        """Return the highest power over the window."""
+        if not self._max_queue:
+            return None
+        return self._power[self._max_queue[0] % self.capacity]
+
+    @property
+    def maximum_time(self):
+        """Return when the highest power over the window was first reached."""
+        if not self._max_queue:
+            return None
+        return self._timestamps[self._max_queue[0] % self.capacity]
+
+    @property
+    def minimum(self):
+        """Return the lowest power over the window."""
+        if not self._min_queue:
+            return None
+        return self._power[self._min_queue[0] % self.capacity]
+
+    @property
+    def latest(self):
+        """Return the newest (timestamp, power, energy_today) sample."""
+        if self._next == self._first:
+            return None
+        index = (self._next - 1) % self.capacity
+        return self._timestamps[index], self._power[index], self._energy[index]
+
+    def samples(self):
+        """Return the samples in the window, oldest first."""
+        capacity = self.capacity
+        return [
+            (
+                self._timestamps[number % capacity],
+                self._power[number % capacity],
+                self._energy[number % capacity],
+            )
+            for number in range(self._first, self._next)
+        ]
+
+    def as_dict(self):
+        """Return the statistics for diagnostics."""
+        return {
+            "window": self.window,
+            "samples": len(self),
+            "mean": self.mean,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "maximum_time": self.maximum_time,
+            "peak_today": self.peak_today,
+            "peak_time": self.peak_time,
+        }
+
+
+class SampleWindow:
+    """Aggregate the samples taken between two published states.
+
+    Power is integrated with the trapezoidal rule, so the mean is weighted
+    by time and the energy covers the whole window. The last sample of a
+    window anchors the next one. Gaps longer than max_gap (the device was
+    unreachable) are not integrated.
+    """
+
+    __slots__ = ("max_gap", "samples", "energy", "duration", "maximum", "_last_time", "_last_power")
+
+    def __init__(self, max_gap):
+        """Initialize."""
+        self.max_gap = max_gap
+        self.samples = 0
+        self.energy = 0.0
+        self.duration = 0.0
+        self.maximum = None
+        self._last_time = None
+        self._last_power = None
+
+    def add(self, timestamp, power):
+        """Fold in one sample taken at timestamp (seconds)."""
+        last_time = self._last_time
+        if last_time is not None and 0 < timestamp - last_time <= self.max_gap:
+            elapsed = timestamp - last_time
+            self.energy += (self._last_power + power) / 2 * elapsed / 3600
+            self.duration += elapsed
+        self.samples += 1
+        if self.maximum is None or power > self.maximum:
+            self.maximum = power
+        self._last_time = timestamp
+        self._last_power = power
+
+    def publish(self):
+        """Return (mean W, maximum W, energy Wh) and start the next window.
+
+        Return None if no sample was taken since the last call.
+        """
+        if not self.samples:
+            return None
+        mean = self.energy * 3600 / self.duration if self.duration else self._last_power
+        result = (mean, self.maximum, self.energy)
+        self.samples = 0
+        self.energy = 0.0
+        self.duration = 0.0
+        self.maximum = None
+        return result
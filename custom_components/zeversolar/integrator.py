@@ -0,0 +1,160 @@
+"""Trapezoidal energy integrator behind the Integrated Energy Today sensor."""
+from datetime import date
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# How to integrate across a gap between samples longer than max_gap:
+# skip leaves it to the device counter to fill in, linear assumes power
+# changed linearly, hold assumes the previous power lasted until the gap ended.
+GAP_POLICY_SKIP = "skip"
+GAP_POLICY_LINEAR = "linear"
+GAP_POLICY_HOLD = "hold"
+GAP_POLICIES = [GAP_POLICY_SKIP, GAP_POLICY_LINEAR, GAP_POLICY_HOLD]
+
+# The integrated total is kept between the device counter and the counter
+# plus this many kWh, which bounds the drift against the device.
+ANCHOR_TOLERANCE = 0.1
+
+
+class EnergyIntegrator:
+    """Integrate current_power over the real sample timestamps into kWh today.
+
+    ``update`` folds one sample in O(1). The total never decreases within a
+    day: it is raised to the device's energy_today counter when it falls
+    behind and stops growing when it runs more than ANCHOR_TOLERANCE ahead.
+    A counter that drops by more than ANCHOR_TOLERANCE is a counter restart,
+    not noise, and is stacked on top of the total reached so far.
+    """
+
+    __slots__ = (
+        "gap_policy",
+        "total",
+        "date",
+        "last_time",
+        "last_power",
+        "counter_offset",
+        "last_counter",
+        "stale_counter",
+        "gaps",
+        "anchors",
+        "clamps",
+    )
+
+    def __init__(self, gap_policy=GAP_POLICY_SKIP):
+        """Initialize."""
+        self.gap_policy = gap_policy
+        self.total = 0.0
+        self.date = None
+        self.last_time = None
+        self.last_power = None
+        self.counter_offset = 0.0
+        self.last_counter = None
+        self.stale_counter = None
+        self.gaps = 0
+        self.anchors = 0
+        self.clamps = 0
+
+    def as_dict(self):
+        """Return the state to persist across restarts."""
+        return {
+            "total": self.total,
+            "date": self.date.isoformat() if self.date else None,
+            "last_time": self.last_time,
+            "last_power": self.last_power,
+            "counter_offset": self.counter_offset,
+            "last_counter": self.last_counter,
+            "stale_counter": self.stale_counter,
+        }
+
+    def restore(self, data):
+        """Restore the state saved by as_dict."""
+        try:
+            self.total = data["total"]
+            self.date = date.fromisoformat(data["date"]) if data["date"] else None
+            self.last_time = data["last_time"]
+            self.last_power = data["last_power"]
+            self.counter_offset = data["counter_offset"]
+            self.last_counter = data["last_counter"]
+            self.stale_counter = data["stale_counter"]
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.warning("Ignoring stored energy integrator state: %s", error)
+            self._reset()
+
+    def _reset(self):
+        """Return to the state of a new instance."""
+        fresh = EnergyIntegrator(self.gap_policy)
+        for name in self.__slots__:
+            setattr(self, name, getattr(fresh, name))
+
+    def update(self, timestamp, power, counter, current_date, max_gap):
+        """Fold in one sample and return the total in kWh.
+
+        timestamp is in seconds since the epoch, power in W and counter is
+        the device's energy_today in kWh.
+        """
+        if current_date != self.date:
+            if self.date is not None:
+                _LOGGER.debug("Integrated energy for %s: %.3f kWh", self.date, self.total)
+                # Until the inverter restarts in the morning the stick may
+                # still report yesterday's counter; do not anchor to it.
+                self.stale_counter = self.last_counter or 0.0
+            self.date = current_date
+            self.total = 0.0
+            self.counter_offset = 0.0
+            self.last_counter = None
+            self.last_time = None
+
+        self._anchor(counter, power)
+        ceiling = (
+            self.counter_offset + self.last_counter + ANCHOR_TOLERANCE
+            if self.last_counter is not None
+            else None
+        )
+
+        last_time = self.last_time
+        if last_time is not None and timestamp > last_time:
+            elapsed = timestamp - last_time
+            if elapsed <= max_gap or self.gap_policy == GAP_POLICY_LINEAR:
+                energy = (self.last_power + power) / 2 * elapsed
+            elif self.gap_policy == GAP_POLICY_HOLD:
+                energy = self.last_power * elapsed
+            else:
+                energy = 0.0
+            if elapsed > max_gap:
+                self.gaps += 1
+            total = self.total + energy / 3_600_000
+            if ceiling is not None and total > ceiling:
+                self.clamps += 1
+                total = max(self.total, ceiling)
+            self.total = total
+
+        self.last_time = timestamp
+        self.last_power = power
+        return self.total
+
+    def _anchor(self, counter, power):
+        """Raise the total to the device counter if it fell behind."""
+        if self.stale_counter is not None:
+            # Yesterday's counter is only reported while the inverter is
+            # off. Once it produces, a counter that moved is today's, even
+            # if it is above yesterday's (Home Assistant was down overnight).
+            if counter >= self.stale_counter and (power <= 0 or counter == self.stale_counter):
+                return
+            self.stale_counter = None
+
+        if self.last_counter is not None and counter < self.last_counter - ANCHOR_TOLERANCE:
+            _LOGGER.info(
+                "Inverter energy counter restarted: previous=%s, current=%s",
+                self.last_counter,
+                counter,
+            )
+            # Continue from the integrated total, which already covers the
+            # part of the old counter that its coarse steps had not shown yet
+            self.counter_offset = self.total - counter
+        self.last_counter = counter
+
+        device_total = self.counter_offset + counter
+        if self.total < device_total:
+            self.anchors += 1
+            self.total = device_total
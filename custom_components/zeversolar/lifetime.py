@@ -0,0 +1,105 @@
+"""Lifetime, month-to-date and year-to-date energy built from daily totals."""
+from datetime import date
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LifetimeEnergy:
+    """Add up the final total of every closed day.
+
+    The running day's total is kept separately and replaced by each sample,
+    so a total that is corrected within the day is never counted twice.
+    Closing a day adds its total to the lifetime, month and year sums and
+    starts the month and year sums over when the next day is in a new
+    month or year. Both ``update`` and ``roll_over`` are O(1); days without
+    any sample (outages, a stopped Home Assistant) simply add nothing.
+    """
+
+    __slots__ = ("date", "today", "closed", "month_closed", "year_closed", "closed_days")
+
+    def __init__(self):
+        """Initialize."""
+        self.date = None
+        self.today = 0.0
+        self.closed = 0.0
+        self.month_closed = 0.0
+        self.year_closed = 0.0
+        self.closed_days = 0
+
+    @property
+    def total(self):
+        """Return the lifetime energy in kWh."""
+        return self.closed + self.today
+
+    @property
+    def month(self):
+        """Return the energy of the current month in kWh."""
+        return self.month_closed + self.today
+
+    @property
+    def year(self):
+        """Return the energy of the current year in kWh."""
+        return self.year_closed + self.today
+
+    def as_dict(self):
+        """Return the state to persist across restarts."""
+        return {
+            "date": self.date.isoformat() if self.date else None,
+            "today": self.today,
+            "closed": self.closed,
+            "month_closed": self.month_closed,
+            "year_closed": self.year_closed,
+            "closed_days": self.closed_days,
+        }
+
+    def restore(self, data):
+        """Restore the state saved by as_dict."""
+        try:
+            self.date = date.fromisoformat(data["date"]) if data["date"] else None
+            self.today = data["today"]
+            self.closed = data["closed"]
+            self.month_closed = data["month_closed"]
+            self.year_closed = data["year_closed"]
+            self.closed_days = data["closed_days"]
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.warning("Ignoring stored lifetime energy state: %s", error)
+            self._reset()
+
+    def _reset(self):
+        """Return to the state of a new instance."""
+        fresh = LifetimeEnergy()
+        for name in self.__slots__:
+            setattr(self, name, getattr(fresh, name))
+
+    def update(self, current_date, total):
+        """Set the total of current_date in kWh, closing the previous day first."""
+        if current_date != self.date:
+            self.roll_over(current_date)
+        if current_date == self.date and total >= 0:
+            self.today = total
+
+    def roll_over(self, current_date):
+        """Close the running day if current_date is a later day."""
+        previous = self.date
+        if previous is None:
+            self.date = current_date
+            return
+        if current_date <= previous:
+            # The device day never steps back; ignore a clock set backwards
+            return
+
+        today = self.today
+        self.closed += today
+        if (current_date.year, current_date.month) == (previous.year, previous.month):
+            self.month_closed += today
+        else:
+            self.month_closed = 0.0
+        if current_date.year == previous.year:
+            self.year_closed += today
+        else:
+            self.year_closed = 0.0
+        self.closed_days += 1
+        _LOGGER.debug("Closed %s with %.3f kWh, lifetime %.3f kWh", previous, today, self.closed)
+        self.date = current_date
+        self.today = 0.0
@@ -0,0 +1,122 @@
+"""Per-device poll metrics for diagnostics."""
+from bisect import bisect_left
+
+from .api import (
+    ZeversolarBusyError,
+    ZeversolarDeadlineError,
+    ZeversolarHttpError,
+    ZeversolarTimeoutError,
+)
+from .parser import ZeversolarParseError
+
+# Upper bounds of the latency histogram buckets in milliseconds; the last
+# bucket counts everything slower.
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class DeviceMetrics:
+    """Counters and a latency histogram for the requests to one stick.
+
+    Every record method is O(1) and allocation free, so collecting is cheap
+    enough to stay on for every poll.
+    """
+
+    __slots__ = (
+        "requests",
+        "latency_histogram",
+        "last_latency",
+        "timeouts",
+        "http_errors",
+        "connection_errors",
+        "parse_errors",
+        "busy",
+        "deadline_misses",
+        "skipped_ticks",
+        "last_parse_time",
+        "total_parse_time",
+        "parses",
+        "bytes_received",
+        "last_success",
+    )
+
+    def __init__(self):
+        """Initialize."""
+        self.requests = 0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.last_latency = None
+        self.timeouts = 0
+        self.http_errors = 0
+        self.connection_errors = 0
+        self.parse_errors = 0
+        self.busy = 0
+        self.deadline_misses = 0
+        self.skipped_ticks = 0
+        self.last_parse_time = None
+        self.total_parse_time = 0.0
+        self.parses = 0
+        self.bytes_received = 0
+        self.last_success = None
+
+    @property
+    def errors(self):
+        """Return the total number of failed polls."""
+        return (
+            self.timeouts
+            + self.deadline_misses
+            + self.http_errors
+            + self.connection_errors
+            + self.parse_errors
+            + self.busy
+        )
+
+    def record_request(self, latency, size):
+        """Record a request that returned a body of size bytes."""
+        self.requests += 1
+        self.last_latency = latency
+        self.latency_histogram[bisect_left(LATENCY_BUCKETS, latency * 1000)] += 1
+        self.bytes_received += size
+
+    def record_error(self, error):
+        """Record a failed request or parse."""
+        if isinstance(error, ZeversolarParseError):
+            self.parse_errors += 1
+            return
+        if isinstance(error, ZeversolarBusyError):
+            # Never sent; the stick's request budget was used up
+            self.busy += 1
+            return
+        self.requests += 1
+        if isinstance(error, ZeversolarDeadlineError):
+            self.deadline_misses += 1
+        elif isinstance(error, ZeversolarTimeoutError):
+            self.timeouts += 1
+        elif isinstance(error, ZeversolarHttpError):
+            self.http_errors += 1
+        else:
+            self.connection_errors += 1
+
+    def record_parse(self, duration):
+        """Record the time spent parsing one body."""
+        self.parses += 1
+        self.last_parse_time = duration
+        self.total_parse_time += duration
+
+    def as_dict(self):
+        """Return the metrics for diagnostics."""
+        bounds = [f"<={bound}ms" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}ms"]
+        return {
+            "requests": self.requests,
+            "latency_histogram": dict(zip(bounds, self.latency_histogram)),
+            "last_latency_ms": round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            "timeouts": self.timeouts,
+            "http_errors": self.http_errors,
+            "connection_errors": self.connection_errors,
+            "parse_errors": self.parse_errors,
+            "busy": self.busy,
+            "deadline_misses": self.deadline_misses,
+            "skipped_ticks": self.skipped_ticks,
+            "last_parse_time_us": round(self.last_parse_time * 1e6, 1) if self.last_parse_time is not None else None,
+            "mean_parse_time_us": round(self.total_parse_time / self.parses * 1e6, 1) if self.parses else None,
+            "bytes_received": self.bytes_received,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+        }
@@ -0,0 +1,189 @@
+"""Parser for the home.cgi payload of Zeversolar Wi-Fi sticks.
+
+The payload is one value per line::
+
+    wifi_enabled, display_mode, serial_number, registry_key,
+    hardware_version, software_version, time, cloud_status, inverter_count,
+    then per inverter: serial, current power (W), energy today (kWh), status
+
+followed by a trailing status line that is ignored.
+"""
+from itertools import islice
+
+from .api import ZeversolarError
+
+HEADER_LINES = 9  # up to and including the inverter count
+INVERTER_LINES = 4  # serial, power, energy today, status
+MAX_INVERTERS = 64
+
+
+class ZeversolarParseError(ZeversolarError):
+    """Error raised when a home.cgi payload is malformed."""
+
+
+class InverterSnapshot:
+    """One inverter block of a home.cgi response."""
+
+    __slots__ = ("inverter_serial", "current_power", "energy_today", "inverter_status")
+
+    def __init__(self, inverter_serial, current_power, energy_today, inverter_status):
+        """Initialize."""
+        self.inverter_serial = inverter_serial
+        self.current_power = current_power
+        self.energy_today = energy_today
+        self.inverter_status = inverter_status
+
+    def as_offline(self):
+        """Return a copy marked offline with zero power."""
+        return InverterSnapshot(self.inverter_serial, 0, self.energy_today, "Offline")
+
+    def as_dict(self):
+        """Return the snapshot as a dict."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class GatewaySnapshot:
+    """A parsed home.cgi response: stick identity, inverters and their aggregate.
+
+    ``current_power``, ``energy_today``, ``inverter_status`` and
+    ``inverter_serial`` hold the aggregate over all inverters, so a gateway
+    with one inverter reads exactly like that inverter.
+    """
+
+    __slots__ = (
+        "wifi_enabled",
+        "display_mode",
+        "serial_number",
+        "registry_key",
+        "hardware_version",
+        "software_version",
+        "time",
+        "cloud_status",
+        "inverter_count",
+        "inverters",
+        "inverter_serial",
+        "current_power",
+        "energy_today",
+        "inverter_status",
+    )
+
+    def __init__(
+        self,
+        wifi_enabled,
+        display_mode,
+        serial_number,
+        registry_key,
+        hardware_version,
+        software_version,
+        time,
+        cloud_status,
+        inverters,
+    ):
+        """Initialize and compute the aggregate over inverters."""
+        self.wifi_enabled = wifi_enabled
+        self.display_mode = display_mode
+        self.serial_number = serial_number
+        self.registry_key = registry_key
+        self.hardware_version = hardware_version
+        self.software_version = software_version
+        self.time = time
+        self.cloud_status = cloud_status
+        self.inverter_count = len(inverters)
+        self.inverters = inverters
+
+        if not inverters:
+            # No inverter data available
+            self.inverter_serial = "unknown"
+            self.current_power = 0
+            self.energy_today = 0
+            self.inverter_status = "No Data"
+            return
+
+        current_power = 0
+        energy_today = 0.0
+        status = "Online"
+        for inverter in inverters.values():
+            current_power += inverter.current_power
+            energy_today += inverter.energy_today
+            if status == "Online":
+                status = inverter.inverter_status
+        self.inverter_serial = next(iter(inverters))
+        self.current_power = current_power
+        self.energy_today = round(energy_today, 2)
+        self.inverter_status = status
+
+    @classmethod
+    def unknown(cls, time):
+        """Return a placeholder for a device that has never answered."""
+        snapshot = cls("unknown", "unknown", "unknown", "unknown", "unknown", "unknown", time, "unknown", {})
+        snapshot.inverter_status = "Offline"
+        return snapshot
+
+    def as_offline(self):
+        """Return a copy marked offline with zero power."""
+        snapshot = GatewaySnapshot(
+            self.wifi_enabled,
+            self.display_mode,
+            self.serial_number,
+            self.registry_key,
+            self.hardware_version,
+            self.software_version,
+            self.time,
+            self.cloud_status,
+            {serial: inverter.as_offline() for serial, inverter in self.inverters.items()},
+        )
+        snapshot.inverter_status = "Offline"
+        return snapshot
+
+    def as_dict(self):
+        """Return the snapshot as a dict, inverters included."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["inverters"] = {
+            serial: inverter.as_dict() for serial, inverter in self.inverters.items()
+        }
+        return data
+
+
+def parse_home(body):
+    """Parse a home.cgi body into a GatewaySnapshot.
+
+    The body is split into lines once; for payloads of this size that is
+    faster than reading it lazily. Inverter blocks are grouped straight off
+    one iterator over those lines, numeric fields are converted once, and
+    every inverter block announced in the header must be present with a
+    serial of its own.
+    """
+    lines = body.strip().splitlines()
+    if len(lines) < HEADER_LINES:
+        raise ZeversolarParseError(f"Truncated home.cgi header ({len(lines)} lines)")
+
+    try:
+        inverter_count = int(lines[HEADER_LINES - 1])
+        if not 0 <= inverter_count <= MAX_INVERTERS:
+            raise ZeversolarParseError(f"Implausible inverter count {inverter_count}")
+        if len(lines) < HEADER_LINES + inverter_count * INVERTER_LINES:
+            raise ZeversolarParseError(
+                f"home.cgi announces {inverter_count} inverters but is truncated"
+            )
+
+        blocks = iter(lines)
+        for _ in range(HEADER_LINES):
+            next(blocks)
+        inverters = {}
+        for serial, current_power, energy_today, status in islice(
+            zip(blocks, blocks, blocks, blocks), inverter_count
+        ):
+            if serial in inverters:
+                raise ZeversolarParseError(f"Duplicate inverter serial {serial} in home.cgi payload")
+            inverters[serial] = InverterSnapshot(
+                serial,
+                int(current_power),
+                float(energy_today),
+                "Online" if status == "OK" else status,
+            )
+    except ValueError as error:
+        raise ZeversolarParseError(f"Invalid value in home.cgi payload: {error}") from error
+
+    return GatewaySnapshot(
+        lines[0], lines[1], lines[2], lines[3], lines[4], lines[5], lines[6], lines[7], inverters
+    )
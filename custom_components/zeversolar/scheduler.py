@@ -0,0 +1,172 @@
+"""Shared poll scheduler for all Zeversolar config entries."""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import random
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DEFAULT_MAX_CONCURRENT_POLLS, DOMAIN, POLL_JITTER
+
+_LOGGER = logging.getLogger(__name__)
+
+# Successive multiples of the golden ratio (mod 1) fill the unit interval
+# evenly no matter how many entries are registered, so phases never need
+# to be rebalanced when entries come and go.
+_GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
+
+class PollStats:
+    """Latency statistics for the polls of one device."""
+
+    __slots__ = (
+        "polls",
+        "last_latency",
+        "mean_latency",
+        "max_latency",
+        "last_queue_delay",
+        "max_queue_delay",
+    )
+
+    def __init__(self):
+        """Initialize."""
+        self.polls = 0
+        self.last_latency = 0.0
+        self.mean_latency = 0.0
+        self.max_latency = 0.0
+        self.last_queue_delay = 0.0
+        self.max_queue_delay = 0.0
+
+    def record(self, latency, queue_delay):
+        """Record one finished poll."""
+        self.polls += 1
+        self.last_latency = latency
+        self.mean_latency += (latency - self.mean_latency) / self.polls
+        self.max_latency = max(self.max_latency, latency)
+        self.last_queue_delay = queue_delay
+        self.max_queue_delay = max(self.max_queue_delay, queue_delay)
+
+    def as_dict(self):
+        """Return the statistics as a dict, latencies in milliseconds."""
+        return {
+            "polls": self.polls,
+            "last_latency_ms": round(self.last_latency * 1000, 1),
+            "mean_latency_ms": round(self.mean_latency * 1000, 1),
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+            "last_queue_delay_ms": round(self.last_queue_delay * 1000, 1),
+            "max_queue_delay_ms": round(self.max_queue_delay * 1000, 1),
+        }
+
+
+class ZeversolarPollScheduler:
+    """Spread the polls of many coordinators evenly over their interval.
+
+    Coordinators registered here do not schedule themselves. Each one gets
+    a fixed phase within its poll interval, a single loop timer fires for
+    whichever poll is due next, and a semaphore caps how many requests are
+    in flight at once. That includes the optional immediate first poll,
+    which is followed by the first poll in phase.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrent=DEFAULT_MAX_CONCURRENT_POLLS):
+        """Initialize."""
+        self.hass = hass
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._queue = []
+        self._registered = set()
+        self._sequence = itertools.count()
+        self._slots = itertools.count()
+        self._timer = None
+
+    @callback
+    def async_register(self, coordinator, poll_now=False) -> CALLBACK_TYPE:
+        """Start polling a coordinator and return a callback to stop."""
+        interval = coordinator.poll_interval.total_seconds()
+        phase = (next(self._slots) * _GOLDEN_RATIO_CONJUGATE) % 1.0
+        jitter = random.uniform(0, POLL_JITTER)
+        self._registered.add(coordinator)
+        now = self.hass.loop.time()
+        due = now + phase * interval + jitter
+        if poll_now:
+            # Never poll twice in quick succession when the phase is early
+            if due - now < interval / 2:
+                due += interval
+            self._push(now, coordinator, due - interval)
+        else:
+            self._push(due, coordinator)
+
+        @callback
+        def _unregister():
+            self._registered.discard(coordinator)
+            if not self._registered and self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+                self._queue.clear()
+
+        return _unregister
+
+    def _push(self, due, coordinator, slot=None):
+        """Queue a poll of a coordinator.
+
+        The poll after it is due one interval after slot, which defaults to
+        due.
+        """
+        heapq.heappush(
+            self._queue, (due, next(self._sequence), coordinator, due if slot is None else slot)
+        )
+        if self._queue[0][2] is coordinator:
+            self._arm()
+
+    def _arm(self):
+        """Point the timer at the earliest queued poll."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._queue:
+            self._timer = self.hass.loop.call_at(self._queue[0][0], self._fire)
+
+    @callback
+    def _fire(self):
+        """Start every poll that is due."""
+        self._timer = None
+        now = self.hass.loop.time()
+        while self._queue and self._queue[0][0] <= now:
+            due, _, coordinator, slot = heapq.heappop(self._queue)
+            if coordinator in self._registered:
+                self._create_task(
+                    self._async_poll(coordinator, due, slot), f"{DOMAIN} poll {coordinator.url}"
+                )
+        self._arm()
+
+    def _create_task(self, target, name):
+        """Start a poll that does not hold up Home Assistant's shutdown."""
+        # Background tasks were added in Home Assistant 2023.4
+        if hasattr(self.hass, "async_create_background_task"):
+            return self.hass.async_create_background_task(target, name)
+        return self.hass.async_create_task(target)
+
+    async def _async_poll(self, coordinator, due, slot):
+        """Run one poll and queue the next one in the same phase."""
+        try:
+            async with self._semaphore:
+                start = self.hass.loop.time()
+                await coordinator.async_refresh()
+                coordinator.poll_stats.record(
+                    self.hass.loop.time() - start, max(0.0, start - due)
+                )
+        finally:
+            if coordinator in self._registered:
+                interval = coordinator.poll_interval.total_seconds()
+                now = self.hass.loop.time()
+                next_due = slot + interval
+                if next_due <= now:
+                    # Skip the slots we overran instead of bursting to catch up
+                    _LOGGER.debug(
+                        "Poll of %s overran its slot, skipping ahead", coordinator.url
+                    )
+                    skipped = math.ceil((now - next_due) / interval + 1e-9)
+                    coordinator.metrics.skipped_ticks += skipped
+                    next_due += skipped * interval
+                self._push(next_due, coordinator)
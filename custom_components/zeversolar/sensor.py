@@ -1,22 +1,29 @@
 """Support for Zeversolar sensors."""
 import logging
-from datetime import datetime, date
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoredExtraData, RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
+from .accumulator import DailyEnergyAccumulator
 from .const import (
     DOMAIN,
     SENSOR_TYPES,
+    DIAGNOSTIC_SENSOR_TYPES,
+    STATISTIC_SENSOR_TYPES,
+    SAMPLED_SENSOR_TYPES,
     ATTR_SERIAL_NUMBER,
     ATTR_REGISTRY_KEY,
     ATTR_HARDWARE_VERSION,
     ATTR_SOFTWARE_VERSION,
     ATTR_INVERTER_STATUS,
+    ATTR_CONNECTION_STATE,
+    ATTR_NEXT_PROBE,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,194 +35,451 @@ async def async_setup_entry(
     """Set up Zeversolar sensor based on a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Wait for coordinator to get data
-    await coordinator.async_config_entry_first_refresh()
+    # The gateway sensors are added as soon as there is a snapshot, restored
+    # or live, so the device they belong to is known. Gateways with several
+    # inverters also get entities per inverter, added without a reload when
+    # the stick first reports them. Entities of an inverter that disappears
+    # are kept, unavailable, until the user removes its device.
+    gateway_added = False
 
-    entities = []
-    for sensor_type in SENSOR_TYPES:
-        entities.append(ZeversolarSensor(coordinator, sensor_type, entry))
+    @callback
+    def _async_update_entities():
+        """Add entities for a new snapshot or newly reported inverters."""
+        nonlocal gateway_added
+        if coordinator.data is None:
+            return
+        if not gateway_added:
+            async_add_entities(_build_entities(coordinator, entry))
+            gateway_added = True
+
+        inverters = coordinator.data.inverters
+        if len(inverters) < 2:
+            return
+        new_inverters = inverters.keys() - coordinator.known_inverters
+        if new_inverters:
+            async_add_entities(
+                [
+                    entity
+                    for inverter_serial in sorted(new_inverters)
+                    for entity in _build_entities(coordinator, entry, inverter_serial)
+                ]
+            )
+            coordinator.known_inverters |= new_inverters
+
+    _async_update_entities()
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_entities))
+
+
+def _build_entities(coordinator, entry, inverter_serial=None):
+    """Build the sensors for the gateway aggregate or a single inverter."""
+    entities = [
+        ZeversolarSensor(coordinator, sensor_type, entry, inverter_serial)
+        for sensor_type in SENSOR_TYPES
+    ]
 
     # Add an additional sensor for inverter status
-    entities.append(ZeversolarStatusSensor(coordinator, entry))
+    entities.append(ZeversolarStatusSensor(coordinator, entry, inverter_serial))
 
-    async_add_entities(entities)
+    entities.extend(
+        ZeversolarStatisticSensor(coordinator, sensor_type, entry, inverter_serial)
+        for sensor_type in STATISTIC_SENSOR_TYPES
+    )
 
+    if coordinator.sample_interval:
+        entities.extend(
+            ZeversolarSampledSensor(coordinator, sensor_type, entry, inverter_serial)
+            for sensor_type in SAMPLED_SENSOR_TYPES
+        )
 
-class ZeversolarSensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Zeversolar sensor."""
+    if inverter_serial is None:
+        entities.extend(
+            ZeversolarDiagnosticSensor(coordinator, sensor_type, entry)
+            for sensor_type in DIAGNOSTIC_SENSOR_TYPES
+        )
+    return entities
 
-    def __init__(self, coordinator, sensor_type, entry):
-        """Initialize the sensor."""
+
+# LifetimeEnergy property behind each lifetime sensor
+_LIFETIME_VALUES = {
+    "energy_this_month": "month",
+    "energy_this_year": "year",
+    "lifetime_energy": "total",
+}
+
+
+def _unique_id(entry, key, inverter_serial=None):
+    """Return the unique ID of a gateway or per-inverter sensor."""
+    if inverter_serial is None:
+        return f"{entry.entry_id}_{key}"
+    return f"{entry.entry_id}_{inverter_serial}_{key}"
+
+
+class ZeversolarEntity(CoordinatorEntity):
+    """Base entity for the gateway aggregate or one inverter behind it.
+
+    device_info and extra_state_attributes are built once and rebuilt only
+    when the fields they are made of change.
+    """
+
+    # Identity attributes rarely change; keep them out of the recorder
+    _unrecorded_attributes = frozenset(
+        {ATTR_SERIAL_NUMBER, ATTR_REGISTRY_KEY, ATTR_HARDWARE_VERSION, ATTR_SOFTWARE_VERSION}
+    )
+
+    # Set by _set_description for the sensor subclasses
+    _attr_native_unit_of_measurement: str | None
+    _attr_state_class: str | None
+
+    def __init__(self, coordinator, entry, inverter_serial=None):
+        """Initialize the entity."""
         super().__init__(coordinator)
-        self._sensor_type = sensor_type
         self._config_entry = entry
-        self._attr_name = f"{SENSOR_TYPES[sensor_type]['name']}"
-        self._attr_unique_id = f"{entry.entry_id}_{sensor_type}"
-        self._attr_native_unit_of_measurement = SENSOR_TYPES[sensor_type]["unit"]
-        self._attr_icon = SENSOR_TYPES[sensor_type]["icon"]
-        self._attr_device_class = SENSOR_TYPES[sensor_type]["device_class"]
-        self._attr_state_class = SENSOR_TYPES[sensor_type]["state_class"]
-        
-        # For tracking energy values and daily accumulators
-        self._previous_energy_today = None
-        self._today_accumulated_energy = 0
-        self._last_reset_date = None
+        self._inverter_serial = inverter_serial
+        self._device_info = None
+        self._device_info_key = None
+        self._attributes = None
+        self._attributes_key = None
+
+    def _set_description(self, key, description):
+        """Set the name, unique ID, unit, icon and classes from a description."""
+        self._attr_name = description["name"]
+        if self._inverter_serial is not None:
+            self._attr_name = f"{self._inverter_serial} {self._attr_name}"
+        self._attr_unique_id = _unique_id(self._config_entry, key, self._inverter_serial)
+        self._attr_native_unit_of_measurement = description["unit"]
+        self._attr_icon = description["icon"]
+        self._attr_device_class = description["device_class"]
+        self._attr_state_class = description["state_class"]
+
+    @property
+    def _data(self):
+        """Return the gateway aggregate or this entity's inverter block."""
+        if self.coordinator.data is None:
+            return None
+        if self._inverter_serial is None:
+            return self.coordinator.data
+        return self.coordinator.data.inverters.get(self._inverter_serial)
+
+    @property
+    def _inverter_missing(self):
+        """Return True if this entity's inverter is not in the current snapshot."""
+        return self._inverter_serial is not None and self._data is None
+
+    @property
+    def available(self):
+        """Return True if entity is available."""
+        return super().available and not self._inverter_missing
 
     @property
     def device_info(self):
         """Return device information about this Zeversolar device."""
-        if not self.coordinator.data:
+        gateway = self.coordinator.data
+        if not gateway:
             return None
 
+        key = (gateway.serial_number, gateway.hardware_version, gateway.software_version)
+        if key != self._device_info_key:
+            self._device_info_key = key
+            self._device_info = self._build_device_info(gateway)
+        return self._device_info
+
+    def _build_device_info(self, gateway):
+        """Build the device information from the gateway snapshot."""
+        if self._inverter_serial is not None:
+            return DeviceInfo(
+                identifiers={(DOMAIN, self._inverter_serial)},
+                name=f"Zeversolar Inverter {self._inverter_serial}",
+                manufacturer="Zeversolar",
+                via_device=(DOMAIN, gateway.serial_number),
+            )
+
         return DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.data.get("serial_number", "unknown"))},
+            identifiers={(DOMAIN, gateway.serial_number)},
             name="Zeversolar Inverter",
             manufacturer="Zeversolar",
-            model=self.coordinator.data.get("hardware_version", "unknown"),
-            sw_version=self.coordinator.data.get("software_version", "unknown"),
+            model=gateway.hardware_version,
+            sw_version=gateway.software_version,
         )
 
     @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if not self.coordinator.data:
+    def extra_state_attributes(self):
+        """Return the state attributes of the device."""
+        data = self._data
+        if not data:
             return None
 
-        current_datetime = datetime.now()
-        current_date = current_datetime.date()
+        key = self._attributes_key_for(data)
+        if key != self._attributes_key:
+            self._attributes_key = key
+            self._attributes = self._build_attributes(data)
+        return self._attributes
+
+    def _attributes_key_for(self, data):
+        """Return the values the state attributes are built from."""
+        gateway = self.coordinator.data
+        return (
+            data.inverter_serial,
+            gateway.registry_key,
+            gateway.hardware_version,
+            gateway.software_version,
+        )
+
+    def _build_attributes(self, data):
+        """Build the state attributes."""
+        gateway = self.coordinator.data
+        return {
+            ATTR_SERIAL_NUMBER: data.inverter_serial,
+            ATTR_REGISTRY_KEY: gateway.registry_key,
+            ATTR_HARDWARE_VERSION: gateway.hardware_version,
+            ATTR_SOFTWARE_VERSION: gateway.software_version,
+        }
+
+
+class ZeversolarSensor(ZeversolarEntity, RestoreEntity, SensorEntity):
+    """Representation of a Zeversolar sensor."""
+
+    def __init__(self, coordinator, sensor_type, entry, inverter_serial=None):
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, inverter_serial)
+        self._sensor_type = sensor_type
+        self._set_description(sensor_type, SENSOR_TYPES[sensor_type])
         
-        if self._sensor_type == "current_power":
-            # Just return the current power value directly
-            return self.coordinator.data.get("current_power", 0)
-            
+        # Daily accumulator behind energy_today_total
+        self._accumulator = DailyEnergyAccumulator()
+
+    async def async_added_to_hass(self):
+        """Restore the accumulator, then compute the first state."""
+        await super().async_added_to_hass()
+        if self._sensor_type == "energy_today_total":
+            last_extra_data = await self.async_get_last_extra_data()
+            if last_extra_data is not None:
+                self._accumulator.restore(last_extra_data.as_dict())
+        self._update_native_value()
+
+    @property
+    def extra_restore_state_data(self):
+        """Return the accumulator state to persist across restarts."""
+        if self._sensor_type != "energy_today_total":
+            return None
+        return RestoredExtraData(self._accumulator.as_dict())
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Fold the new sample in once, then write state."""
+        self._update_native_value()
+        super()._handle_coordinator_update()
+
+    def _update_native_value(self):
+        """Compute the state for the current coordinator data."""
+        data = self._data
+        if not data:
+            self._attr_native_value = None
+        elif self._sensor_type == "current_power":
+            # In sampling mode the published power is the mean over the window
+            published = self.coordinator.published.get(self._inverter_serial)
+            if published is not None:
+                self._attr_native_value = round(published[0], 1)
+            else:
+                self._attr_native_value = data.current_power
         elif self._sensor_type == "energy_today":
-            # Just return the raw energy value from the inverter
-            return self.coordinator.data.get("energy_today", 0)
-            
+            self._attr_native_value = data.energy_today
         elif self._sensor_type == "energy_today_total":
-            # Get the current energy value
-            current_value = self.coordinator.data.get("energy_today", 0)
-            inverter_status = self.coordinator.data.get("inverter_status", "Unknown")
-            
-            # First reading ever
-            if self._previous_energy_today is None:
-                self._previous_energy_today = current_value
-                self._last_reset_date = current_date
-                self._today_accumulated_energy = current_value
-                return current_value
-                
-            # Check for date change (midnight reset)
-            if self._last_reset_date != current_date:
-                _LOGGER.info(
-                    "Daily date change detected: previous_date=%s, current_date=%s", 
-                    self._last_reset_date, 
-                    current_date
-                )
-                # It's a new day, reset accumulators
-                self._last_reset_date = current_date
-                # Start counting from the current value on the new day
-                self._today_accumulated_energy = current_value
-                self._previous_energy_today = current_value
-                return current_value
-                
-            # Check for inverter reset
-            # This happens when the current value is much lower than the previous value
-            # and the inverter just came back online after being offline or reset at midnight
-            if current_value < self._previous_energy_today and (self._previous_energy_today - current_value) > 0.5:
-                _LOGGER.info(
-                    "Inverter reset detected: previous=%s, current=%s, status=%s", 
-                    self._previous_energy_today, 
-                    current_value, 
-                    inverter_status
-                )
-                
-                # If it's a reset, we just start accumulating from the current value
-                # without adding the negative delta to our accumulator
-                self._today_accumulated_energy = current_value
-            else:
-                # Normal operation - accumulate any positive delta
-                if current_value > self._previous_energy_today:
-                    # Only add positive changes to the accumulator
-                    delta = current_value - self._previous_energy_today
-                    self._today_accumulated_energy += delta
-            
-            # Update previous value for next time
-            self._previous_energy_today = current_value
-            
-            # Return the accumulated value
-            return self._today_accumulated_energy
-            
-        return None
+            self._attr_native_value = self._accumulator.update(
+                data.energy_today, data.inverter_status, self.coordinator.day
+            )
+        elif self._sensor_type == "integrated_energy_today":
+            integrator = self.coordinator.integrators.get(self._inverter_serial)
+            self._attr_native_value = round(integrator.total, 3) if integrator else None
+        elif self._sensor_type in _LIFETIME_VALUES:
+            lifetime = self.coordinator.lifetime.get(self._inverter_serial)
+            self._attr_native_value = (
+                round(getattr(lifetime, _LIFETIME_VALUES[self._sensor_type]), 3) if lifetime else None
+            )
+        else:
+            self._attr_native_value = None
 
     @property
     def available(self):
         """Return True if entity is available."""
-        # The sensor is always available, even when the inverter is offline
+        # The sensor is always available, even when the inverter is offline,
+        # unless its inverter is no longer reported by the stick
+        if self._inverter_missing:
+            return False
         return self.coordinator.last_successful_data is not None or self.coordinator.data is not None
 
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes of the device."""
-        if not self.coordinator.data:
-            return None
+    def _attributes_key_for(self, data):
+        """Return the values the state attributes are built from."""
+        return (*super()._attributes_key_for(data), data.inverter_status)
 
-        return {
-            ATTR_SERIAL_NUMBER: self.coordinator.data.get("inverter_serial", "unknown"),
-            ATTR_REGISTRY_KEY: self.coordinator.data.get("registry_key", "unknown"),
-            ATTR_HARDWARE_VERSION: self.coordinator.data.get("hardware_version", "unknown"),
-            ATTR_SOFTWARE_VERSION: self.coordinator.data.get("software_version", "unknown"),
-            ATTR_INVERTER_STATUS: self.coordinator.data.get("inverter_status", "unknown"),
-        }
+    def _build_attributes(self, data):
+        """Build the state attributes."""
+        attributes = super()._build_attributes(data)
+        attributes[ATTR_INVERTER_STATUS] = data.inverter_status
+        return attributes
 
 
-class ZeversolarStatusSensor(CoordinatorEntity, SensorEntity):
+class ZeversolarStatusSensor(ZeversolarEntity, SensorEntity):
     """Representation of a Zeversolar status sensor."""
 
-    def __init__(self, coordinator, entry):
+    def __init__(self, coordinator, entry, inverter_serial=None):
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._config_entry = entry
+        super().__init__(coordinator, entry, inverter_serial)
         self._attr_name = "Inverter Status"
-        self._attr_unique_id = f"{entry.entry_id}_inverter_status"
+        if inverter_serial is not None:
+            self._attr_name = f"{inverter_serial} {self._attr_name}"
+        self._attr_unique_id = _unique_id(entry, "inverter_status", inverter_serial)
         self._attr_icon = "mdi:solar-power"
 
-    @property
-    def device_info(self):
-        """Return device information about this Zeversolar device."""
-        if not self.coordinator.data:
-            return None
-
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.data.get("serial_number", "unknown"))},
-            name="Zeversolar Inverter",
-            manufacturer="Zeversolar",
-            model=self.coordinator.data.get("hardware_version", "unknown"),
-            sw_version=self.coordinator.data.get("software_version", "unknown"),
-        )
-
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if not self.coordinator.data:
+        data = self._data
+        if not data:
             return "Unknown"
 
-        return self.coordinator.data.get("inverter_status", "Unknown")
+        return data.inverter_status
 
     @property
     def available(self):
         """Return True if entity is available."""
-        # The status sensor is always available
-        return True
+        # The status sensor is always available, unless its inverter is no
+        # longer reported by the stick
+        return not self._inverter_missing
+
+    def _attributes_key_for(self, data):
+        """Return the values the state attributes are built from."""
+        key = super()._attributes_key_for(data)
+        if self._inverter_serial is not None:
+            return key
+        breaker = self.coordinator.breaker
+        return (*key, breaker.state, breaker.next_probe)
+
+    def _build_attributes(self, data):
+        """Build the state attributes."""
+        attributes = super()._build_attributes(data)
+        if self._inverter_serial is None:
+            breaker = self.coordinator.breaker
+            attributes[ATTR_CONNECTION_STATE] = breaker.state
+            attributes[ATTR_NEXT_PROBE] = breaker.next_probe
+        return attributes
+
+
+class ZeversolarValueSensor(ZeversolarEntity, SensorEntity):
+    """Sensor whose state is read from one coordinator value by key.
+
+    Subclasses set the description table and the getters, and return the
+    object the getters read from, or None while there is nothing to read.
+    """
+
+    _descriptions = {}
+    _values = {}
+
+    def __init__(self, coordinator, sensor_type, entry, inverter_serial=None):
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, inverter_serial)
+        self._sensor_type = sensor_type
+        self._set_description(sensor_type, self._descriptions[sensor_type])
+        self._value = self._values[sensor_type]
+
+    def _source(self):
+        """Return the object the value is read from, or None."""
+        raise NotImplementedError
 
     @property
-    def extra_state_attributes(self):
-        """Return the state attributes of the device."""
-        if not self.coordinator.data:
+    def native_value(self):
+        """Return the state of the sensor."""
+        source = self._source()
+        if source is None:
             return None
+        return self._value(source)
 
-        return {
-            ATTR_SERIAL_NUMBER: self.coordinator.data.get("inverter_serial", "unknown"),
-            ATTR_REGISTRY_KEY: self.coordinator.data.get("registry_key", "unknown"),
-            ATTR_HARDWARE_VERSION: self.coordinator.data.get("hardware_version", "unknown"),
-            ATTR_SOFTWARE_VERSION: self.coordinator.data.get("software_version", "unknown"),
-        }
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes of the sensor."""
+        return None
+
+
+def _rounded(value, digits=None, scale=1):
+    """Return value times scale rounded to digits, or None."""
+    return round(value * scale, digits) if value is not None else None
+
+
+class ZeversolarStatisticSensor(ZeversolarValueSensor):
+    """Rolling power statistic from the coordinator's sample buffer.
+
+    The values come from memory, not from the recorder, and are disabled by
+    default.
+    """
+
+    _attr_entity_registry_enabled_default = False
+    _descriptions = STATISTIC_SENSOR_TYPES
+    _values = {
+        "power_mean": lambda history: _rounded(history.mean, 1),
+        "power_min": lambda history: history.minimum,
+        "power_max": lambda history: history.maximum,
+        "peak_power_today": lambda history: history.peak_today,
+        "peak_power_time": lambda history: (
+            dt_util.utc_from_timestamp(history.peak_time) if history.peak_time is not None else None
+        ),
+    }
+
+    @property
+    def available(self):
+        """Return True once a live sample has been buffered."""
+        return self._inverter_serial in self.coordinator.history
+
+    def _source(self):
+        """Return this entity's sample buffer."""
+        return self.coordinator.history.get(self._inverter_serial)
+
+
+class ZeversolarSampledSensor(ZeversolarValueSensor):
+    """Aggregate of the samples taken since the previous published state."""
+
+    _descriptions = SAMPLED_SENSOR_TYPES
+    # Published aggregates are (mean power, maximum power, energy)
+    _values = {
+        "sampled_power_max": lambda published: published[1],
+        "sampled_energy": lambda published: round(published[2], 2),
+    }
+
+    def _source(self):
+        """Return the aggregate published for this entity."""
+        return self.coordinator.published.get(self._inverter_serial)
+
+
+class ZeversolarDiagnosticSensor(ZeversolarValueSensor):
+    """Poll metrics of a Zeversolar gateway, disabled by default."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _descriptions = DIAGNOSTIC_SENSOR_TYPES
+    _values = {
+        "poll_latency": lambda coordinator: _rounded(coordinator.metrics.last_latency, 1, 1000),
+        "poll_errors": lambda coordinator: coordinator.metrics.errors,
+        "skipped_ticks": lambda coordinator: coordinator.metrics.skipped_ticks,
+        "skipped_updates": lambda coordinator: coordinator.skipped_updates,
+        "clock_drift": lambda coordinator: _rounded(coordinator.clock.drift),
+        "last_successful_poll": lambda coordinator: coordinator.metrics.last_success,
+    }
+    _attribute_values = {
+        "poll_errors": lambda coordinator: {
+            "timeouts": coordinator.metrics.timeouts,
+            "deadline_misses": coordinator.metrics.deadline_misses,
+            "http_errors": coordinator.metrics.http_errors,
+            "connection_errors": coordinator.metrics.connection_errors,
+            "parse_errors": coordinator.metrics.parse_errors,
+            "busy": coordinator.metrics.busy,
+        },
+        "clock_drift": lambda coordinator: coordinator.clock.as_dict(),
+    }
+
+    def _source(self):
+        """Return the coordinator, which holds the poll metrics."""
+        return self.coordinator
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes of the sensor."""
+        attributes = self._attribute_values.get(self._sensor_type)
+        return attributes(self.coordinator) if attributes else None
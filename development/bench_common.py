@@ -0,0 +1,108 @@
+"""Shared helpers for the Zeversolar development benchmarks."""
+import asyncio
+import importlib
+import importlib.util
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPONENT_DIR = os.path.join(REPO_DIR, "custom_components", "zeversolar")
+
+SAMPLE_HOME_CGI = (
+    "1\n"
+    "1\n"
+    "EAB9618A0399\n"
+    "RSQMPWSRCRT9RVSZ\n"
+    "M11\n"
+    "17A31-727R+17829-719R\n"
+    "10:25 27/10/2020\n"
+    "1\n"
+    "1\n"
+    "BS10000000000038\n"
+    "1234\n"
+    "4.51\n"
+    "OK\n"
+    "Error\n"
+)
+
+
+def make_home_cgi(inverters=1, power=1234, energy=4.51, time="10:25 27/10/2020", serial="EAB9618A0399"):
+    """Build a home.cgi body with the given number of inverter blocks."""
+    lines = ["1", "1", serial, "RSQMPWSRCRT9RVSZ", "M11", "17A31-727R+17829-719R", time, "1", str(inverters)]
+    for index in range(inverters):
+        lines += [f"BS{serial[-6:]}{index:08d}", str(power), f"{energy:.2f}", "OK"]
+    lines.append("Error")
+    return "\n".join(lines) + "\n"
+
+
+def load_component():
+    """Import the integration package without running its __init__.
+
+    The transport and parser modules only depend on aiohttp and the
+    standard library, so the benchmarks can run without Home Assistant.
+    """
+    if "zeversolar" not in sys.modules:
+        spec = importlib.util.spec_from_loader("zeversolar", loader=None, is_package=True)
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [COMPONENT_DIR]
+        sys.modules["zeversolar"] = package
+    return sys.modules["zeversolar"]
+
+
+def load_integration():
+    """Import the full integration package; requires Home Assistant."""
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    return importlib.import_module("custom_components.zeversolar")
+
+
+async def async_create_hass(config_dir):
+    """Create a Home Assistant instance that is good enough for coordinators.
+
+    The instance is not started; it provides the event loop helpers, the
+    shared aiohttp session and storage that the integration uses.
+    """
+    from homeassistant.core import HomeAssistant
+
+    try:
+        hass = HomeAssistant(config_dir)
+    except TypeError:
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+    hass.data.setdefault("zeversolar", {})
+    return hass
+
+
+async def async_start_black_hole():
+    """Start a TCP server that accepts connections and never answers.
+
+    Returns (server, url). Requests to it run into the read timeout, like a
+    stick whose Wi-Fi is up but whose inverter side has gone to sleep.
+    """
+    connections = []
+
+    async def swallow(reader, writer):
+        connections.append(writer)
+        await reader.read()
+
+    server = await asyncio.start_server(swallow, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}"
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples (nearest rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(name, samples_ms):
+    """Print a one-line latency summary."""
+    mean = sum(samples_ms) / len(samples_ms) if samples_ms else 0.0
+    print(
+        f"{name:<28} n={len(samples_ms):<6} mean={mean:8.2f} ms "
+        f"p50={percentile(samples_ms, 50):8.2f} ms p99={percentile(samples_ms, 99):8.2f} ms"
+    )
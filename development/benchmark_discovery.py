@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Measure how long discovery takes to scan a /24 with a few fake sticks on it.
+
+Fake sticks listen on addresses of 127.0.1.0/24 (Linux routes all of
+127.0.0.0/8 to the loopback interface), every other address refuses the
+connection. --silent-hosts adds black-hole servers that accept and never
+answer, which is what dead addresses with a firewall look like.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+from bench_common import SAMPLE_HOME_CGI, load_component
+
+load_component()
+from zeversolar.discovery import async_discover  # noqa: E402
+
+NETWORK = "127.0.1.0/24"
+
+
+async def start_fake_sticks(hosts, port):
+    """Start one fake stick per host address."""
+
+    async def home(request):
+        return web.Response(text=SAMPLE_HOME_CGI)
+
+    app = web.Application()
+    app.router.add_get("/home.cgi", home)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    for host in hosts:
+        await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def start_silent_hosts(hosts, port):
+    """Start servers that accept connections and never answer."""
+
+    async def swallow(reader, writer):
+        await reader.read()
+
+    return [await asyncio.start_server(swallow, host, port) for host in hosts]
+
+
+async def run(args):
+    """Scan the /24 once without and once with an early exit."""
+    stick_hosts = [f"127.0.1.{index}" for index in (10, 77, 200)]
+    silent_hosts = [f"127.0.1.{index}" for index in range(100, 100 + args.silent_hosts)]
+    runner = await start_fake_sticks(stick_hosts, args.port)
+    servers = await start_silent_hosts(silent_hosts, args.port)
+    try:
+        async with aiohttp.ClientSession() as session:
+            for label, max_results in (("full scan", 0), ("early exit", len(stick_hosts))):
+                start = time.perf_counter()
+                devices = await async_discover(
+                    session,
+                    NETWORK,
+                    port=args.port,
+                    max_concurrent=args.concurrency,
+                    timeout=args.timeout,
+                    max_results=max_results,
+                )
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{label:<12} found={len(devices)} "
+                    f"({', '.join(device.url for device in devices)}) in {elapsed:.2f} s"
+                )
+    finally:
+        for server in servers:
+            server.close()
+        await runner.cleanup()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark subnet discovery on a /24")
+    parser.add_argument("--port", type=int, default=8080, help="Port of the fake sticks")
+    parser.add_argument("--concurrency", type=int, default=64, help="Probes in flight")
+    parser.add_argument("--timeout", type=float, default=1.5, help="Per-host timeout in seconds")
+    parser.add_argument("--silent-hosts", type=int, default=20, help="Addresses that never answer")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
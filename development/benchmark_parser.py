@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the home.cgi parser.
+
+Compares parse_home with the dict-building parser the integration used
+before, reporting samples per second and bytes allocated per parse for
+single and multi-inverter payloads.
+"""
+import argparse
+import sys
+import timeit
+import tracemalloc
+
+from bench_common import load_component, make_home_cgi
+
+load_component()
+from zeversolar.parser import parse_home  # noqa: E402
+
+
+def legacy_parse(body):
+    """Parse home.cgi the way fetch_data used to."""
+    data = body.strip().split("\n")
+    result = {
+        "wifi_enabled": data[0],
+        "display_mode": data[1],
+        "serial_number": data[2],
+        "registry_key": data[3],
+        "hardware_version": data[4],
+        "software_version": data[5],
+        "time": data[6],
+        "cloud_status": data[7],
+        "inverter_count": data[8],
+        "inverter_status": "Online",
+    }
+    inverters = {}
+    for index in range(int(data[8])):
+        offset = 9 + index * 4
+        status = data[offset + 3]
+        inverters[data[offset]] = {
+            "inverter_serial": data[offset],
+            "current_power": int(data[offset + 1]),
+            "energy_today": float(data[offset + 2]),
+            "inverter_status": "Online" if status == "OK" else status,
+        }
+    result["inverters"] = inverters
+    if inverters:
+        result["inverter_serial"] = next(iter(inverters))
+        result["current_power"] = sum(
+            inverter["current_power"] for inverter in inverters.values()
+        )
+        result["energy_today"] = round(
+            sum(inverter["energy_today"] for inverter in inverters.values()), 2
+        )
+        result["inverter_status"] = next(
+            (
+                inverter["inverter_status"]
+                for inverter in inverters.values()
+                if inverter["inverter_status"] != "Online"
+            ),
+            "Online",
+        )
+    return result
+
+
+def allocated_bytes(func, body, repeat=1000):
+    """Return the bytes still allocated per call, keeping every result alive."""
+    results = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(repeat):
+        results.append(func(body))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / repeat
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the home.cgi parser")
+    parser.add_argument("--number", type=int, default=20000, help="Parses per measurement")
+    args = parser.parse_args()
+
+    print(f"{'parser':<12} {'inverters':>9} {'samples/s':>12} {'bytes/parse':>12}")
+    for inverters in (1, 4, 16):
+        body = make_home_cgi(inverters=inverters)
+        for name, func in (("legacy", legacy_parse), ("parse_home", parse_home)):
+            seconds = min(timeit.repeat(lambda: func(body), number=args.number, repeat=5))
+            print(
+                f"{name:<12} {inverters:>9} {args.number / seconds:>12,.0f} "
+                f"{allocated_bytes(func, body):>12,.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
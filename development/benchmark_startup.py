@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark how long setting up N config entries takes when no stick answers.
+
+Every entry points at a local black-hole server that accepts connections and
+never replies. The old setup path awaited the first refresh twice per entry
+(once in __init__ and once in the sensor platform); the new path restores the
+stored snapshot and leaves the first poll to the shared scheduler, which
+runs it right away within its concurrency cap. Requires Home Assistant to be
+installed.
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+
+from bench_common import async_create_hass, async_start_black_hole, load_integration
+
+
+async def setup_blocking(hass, integration, scheduler, url, index):
+    """Set up one entry the way the integration used to."""
+    coordinator = integration.ZeversolarDataUpdateCoordinator(hass, url, {}, f"blocking_{index}")
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    return coordinator
+
+
+async def setup_fast(hass, integration, scheduler, url, index):
+    """Set up one entry the way async_setup_entry does now."""
+    coordinator = integration.ZeversolarDataUpdateCoordinator(hass, url, {}, f"fast_{index}")
+    await coordinator.async_restore()
+    scheduler.async_register(coordinator, poll_now=True)
+    return coordinator
+
+
+async def run(args):
+    """Time both setup paths with all entries set up concurrently."""
+    integration = load_integration()
+    server, url = await async_start_black_hole()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        scheduler = sys.modules["custom_components.zeversolar.scheduler"].ZeversolarPollScheduler(hass)
+        try:
+            for name, setup in (("await first refresh twice", setup_blocking), ("fast start", setup_fast)):
+                start = time.perf_counter()
+                await asyncio.gather(*(setup(hass, integration, scheduler, url, index) for index in range(args.entries)))
+                elapsed = time.perf_counter() - start
+                print(f"{name:<28} entries={args.entries:<5} setup time={elapsed:8.3f} s")
+        finally:
+            server.close()
+            await hass.async_stop(force=True)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark entry setup against unreachable sticks")
+    parser.add_argument("--entries", type=int, default=50, help="Config entries to set up")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
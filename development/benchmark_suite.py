@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Repeatable offline benchmark suite for the Zeversolar integration.
+
+Covers the home.cgi parser, the coordinator update path (live, unchanged and
+offline fallback), the energy_today_total accumulator, the power sample
+buffer and the cost of building extra_state_attributes and device_info for
+a state write. No device or network is needed; the coordinator cases
+replace the HTTP client with an in-memory one. Cases that need Home Assistant are skipped when it
+is not installed.
+
+Results are written as JSON. Pass --compare with an earlier result file to
+print the change per case and fail on regressions.
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, timezone
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+
+from bench_common import COMPONENT_DIR, async_create_hass, load_component, load_integration, make_home_cgi
+
+load_component()
+from zeversolar.accumulator import DailyEnergyAccumulator  # noqa: E402
+from zeversolar.history import PowerHistory  # noqa: E402
+from zeversolar.parser import parse_home  # noqa: E402
+
+
+def time_sync(func, number):
+    """Return the best time per call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+async def time_async(func, number):
+    """Return the best time per awaited call in microseconds."""
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        elapsed = (time.perf_counter() - start) / number * 1e6
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def core_cases(number):
+    """Benchmarks that only need the integration's pure modules."""
+    results = {}
+    for inverters in (1, 4, 16):
+        body = make_home_cgi(inverters=inverters)
+        results[f"parse_home[{inverters}]"] = time_sync(lambda: parse_home(body), number)
+
+    accumulator = DailyEnergyAccumulator()
+    today = date(2025, 4, 7)
+    values = [round(index * 0.01, 2) for index in range(1000)]
+    state = {"index": 0}
+
+    def accumulate():
+        state["index"] = (state["index"] + 1) % len(values)
+        accumulator.update(values[state["index"]], "Online", today)
+
+    results["accumulator.update"] = time_sync(accumulate, number)
+    results["accumulator.read"] = time_sync(lambda: accumulator.total, number)
+
+    history = PowerHistory()
+    clock = {"timestamp": 0.0}
+
+    def add_sample():
+        clock["timestamp"] += 15
+        history.add(clock["timestamp"], values[int(clock["timestamp"]) % len(values)] * 1000, 1.0, today)
+
+    results["history.add"] = time_sync(add_sample, number)
+    results["history.read"] = time_sync(lambda: (history.mean, history.minimum, history.maximum), number)
+    return results
+
+
+class MemoryClient:
+    """In-memory replacement for ZeversolarClient."""
+
+    def __init__(self, bodies):
+        """Initialize with the bodies to return in turn, None meaning a failure."""
+        self.bodies = bodies
+        self.index = 0
+        self.bytes_received = 0
+
+    async def async_get_home(self, probe=False, deadline=None):
+        """Return the next body or raise a connection error."""
+        body = self.bodies[self.index % len(self.bodies)]
+        self.index += 1
+        if body is None:
+            # The coordinator catches the integration's error class, not the
+            # one of the package that load_component() imports
+            from custom_components.zeversolar.api import ZeversolarConnectionError
+
+            raise ZeversolarConnectionError("simulated timeout")
+        self.bytes_received += len(body.encode())
+        return body
+
+
+class FakeEntry:
+    """Just enough of a config entry for building entities."""
+
+    entry_id = "benchmark"
+
+
+async def home_assistant_cases(number):
+    """Benchmarks that need Home Assistant."""
+    integration = load_integration()
+    from custom_components.zeversolar import sensor
+
+    results = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        coordinator = integration.ZeversolarDataUpdateCoordinator(hass, "http://benchmark")
+
+        # Two alternating bodies so every update is parsed and delivered
+        coordinator.client = MemoryClient([make_home_cgi(power=1234), make_home_cgi(power=1250)])
+        results["update[changed]"] = await time_async(coordinator._async_update_data, number)
+
+        coordinator.client = MemoryClient([make_home_cgi(power=1234)])
+        await coordinator.async_refresh()
+        results["update[unchanged]"] = await time_async(coordinator._async_update_data, number)
+
+        def reset_breaker():
+            coordinator.breaker.record_success()
+
+        coordinator.client = MemoryClient([None])
+
+        async def failing_update():
+            reset_breaker()
+            return await coordinator._async_update_data()
+
+        results["update[offline, breaker closed]"] = await time_async(failing_update, number)
+        for _ in range(coordinator.breaker.failure_threshold):
+            await coordinator._async_update_data()
+        results["update[offline, breaker open]"] = await time_async(coordinator._async_update_data, number)
+
+        coordinator.client = MemoryClient([make_home_cgi(inverters=2)])
+        await coordinator.async_refresh()
+        for key in ("current_power", "energy_today_total"):
+            entity = sensor.ZeversolarSensor(coordinator, key, FakeEntry())
+            results[f"{key}.extra_state_attributes"] = time_sync(
+                lambda: entity.extra_state_attributes, number
+            )
+            results[f"{key}.device_info"] = time_sync(lambda: entity.device_info, number)
+        status = sensor.ZeversolarStatusSensor(coordinator, FakeEntry())
+        results["status.extra_state_attributes"] = time_sync(lambda: status.extra_state_attributes, number)
+
+        await hass.async_stop(force=True)
+    return results
+
+
+def integration_version():
+    """Return the version from manifest.json."""
+    with open(os.path.join(COMPONENT_DIR, "manifest.json"), encoding="utf-8") as manifest:
+        return json.load(manifest)["version"]
+
+
+def compare(results, previous_path, threshold):
+    """Print the change per case and return the number of regressions."""
+    with open(previous_path, encoding="utf-8") as previous_file:
+        previous = json.load(previous_file)["results"]
+    regressions = 0
+    for name, value in results.items():
+        if name not in previous:
+            continue
+        change = (value - previous[name]) / previous[name] * 100 if previous[name] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<40} {previous[name]:10.2f} -> {value:10.2f} us ({change:+6.1f}%){flag}")
+    return regressions
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--number", type=int, default=10000, help="Calls per measurement")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Regression threshold in percent")
+    args = parser.parse_args()
+
+    results = core_cases(args.number)
+    try:
+        import homeassistant  # noqa: F401
+    except ImportError:
+        print("Home Assistant is not installed, skipping coordinator and entity cases")
+    else:
+        results.update(asyncio.run(home_assistant_cases(args.number)))
+
+    for name, value in results.items():
+        print(f"{name:<40} {value:10.2f} us")
+
+    report = {
+        "version": integration_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "unit": "microseconds per call",
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark the async home.cgi transport against the old requests-in-executor path.
+
+A local fake stick is started on 127.0.0.1 and polled N times per entry by both
+transports. Per-poll latency and the peak number of live threads are reported.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import sys
+import threading
+import time
+
+import aiohttp
+from aiohttp import web
+import requests
+
+from bench_common import SAMPLE_HOME_CGI, load_component, summarize
+
+load_component()
+from zeversolar.api import ZeversolarClient  # noqa: E402
+
+
+async def start_fake_stick(delay):
+    """Start a fake stick and return (runner, url)."""
+
+    async def home(request):
+        if delay:
+            await asyncio.sleep(delay)
+        return web.Response(text=SAMPLE_HOME_CGI)
+
+    app = web.Application()
+    app.router.add_get("/home.cgi", home)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+class ThreadSampler:
+    """Track the peak number of live threads while a block runs."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(0.001):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def bench_executor(url, entries, polls):
+    """Poll with requests.get in the default executor, like the old code."""
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(concurrent.futures.ThreadPoolExecutor())
+    samples = []
+
+    async def poll():
+        start = time.perf_counter()
+        response = await loop.run_in_executor(
+            None, lambda: requests.get(f"{url}/home.cgi", timeout=10)
+        )
+        response.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    for _ in range(polls):
+        await asyncio.gather(*(poll() for _ in range(entries)))
+    return samples
+
+
+async def bench_async(url, entries, polls):
+    """Poll with ZeversolarClient on one shared session."""
+    samples = []
+    async with aiohttp.ClientSession() as session:
+        clients = [ZeversolarClient(session, url) for _ in range(entries)]
+
+        async def poll(client):
+            start = time.perf_counter()
+            await client.async_get_home()
+            samples.append((time.perf_counter() - start) * 1000)
+
+        for _ in range(polls):
+            await asyncio.gather(*(poll(client) for client in clients))
+    return samples
+
+
+async def run(args):
+    """Run both benchmarks against the same fake stick."""
+    runner, url = await start_fake_stick(args.delay)
+    try:
+        base = threading.active_count()
+        with ThreadSampler() as sampler:
+            samples = await bench_executor(url, args.entries, args.polls)
+        summarize("requests in executor", samples)
+        print(f"{'':<28} peak extra threads={sampler.peak - base}")
+
+        base = threading.active_count()
+        with ThreadSampler() as sampler:
+            samples = await bench_async(url, args.entries, args.polls)
+        summarize("aiohttp shared session", samples)
+        print(f"{'':<28} peak extra threads={sampler.peak - base}")
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the home.cgi transport")
+    parser.add_argument("--entries", type=int, default=40, help="Concurrent config entries")
+    parser.add_argument("--polls", type=int, default=20, help="Polls per entry")
+    parser.add_argument("--delay", type=float, default=0.05, help="Simulated stick latency in seconds")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Check that the Energy Today Total accumulator is computed once per sample.
+
+The accumulator is folded forward by the coordinator-update handler; the
+sensor state is a cached value. This script replays a day of samples,
+reads the cached value many times after each one and verifies that the
+reads neither change the total nor cost more than an attribute lookup.
+With Home Assistant installed, it also drives an Energy Today Total sensor
+through its coordinator-update handler and verifies that repeated
+native_value reads leave both the state and the accumulator untouched.
+"""
+import argparse
+from datetime import date
+import importlib
+import sys
+import timeit
+
+from bench_common import load_component, load_integration, make_home_cgi
+
+load_component()
+from zeversolar.accumulator import DailyEnergyAccumulator  # noqa: E402
+
+# energy_today samples including noise, an inverter reset and a midnight rollover
+SAMPLES = [
+    (0.0, date(2025, 4, 7)),
+    (0.4, date(2025, 4, 7)),
+    (1.2, date(2025, 4, 7)),
+    (1.1, date(2025, 4, 7)),
+    (2.5, date(2025, 4, 7)),
+    (0.3, date(2025, 4, 7)),
+    (0.9, date(2025, 4, 7)),
+    (0.1, date(2025, 4, 8)),
+    (0.6, date(2025, 4, 8)),
+]
+EXPECTED = [0.0, 0.4, 1.2, 1.2, 2.6, 0.3, 0.9, 0.1, 0.6]
+
+
+class StubCoordinator:
+    """Just enough of the coordinator for an Energy Today Total sensor."""
+
+    def __init__(self):
+        """Initialize."""
+        self.data = None
+        self.last_successful_data = None
+        self.day = None
+        self.published = {}
+
+
+class StubEntry:
+    """Just enough of a config entry for building entities."""
+
+    entry_id = "check"
+
+
+def _state(accumulator):
+    """Return the fields of an accumulator."""
+    return tuple(getattr(accumulator, name) for name in accumulator.__slots__)
+
+
+def check_sensor(reads):
+    """Drive the sensor once per sample and return the number of failures."""
+    load_integration()
+    sensor = importlib.import_module("custom_components.zeversolar.sensor")
+    parse_home = importlib.import_module("custom_components.zeversolar.parser").parse_home
+
+    coordinator = StubCoordinator()
+    entity = sensor.ZeversolarSensor(coordinator, "energy_today_total", StubEntry())
+    # Not added to Home Assistant, so there is no state to write
+    entity.async_write_ha_state = lambda: None
+    failures = 0
+    for (value, day), expected in zip(SAMPLES, EXPECTED):
+        coordinator.data = coordinator.last_successful_data = parse_home(make_home_cgi(energy=value))
+        coordinator.day = day
+        entity._handle_coordinator_update()
+        state = _state(entity._accumulator)
+        values = {entity.native_value for _ in range(reads)}
+        if {round(value_read, 3) for value_read in values} != {expected}:
+            print(f"sensor, sample {value} on {day}: expected {expected}, read {sorted(values)}")
+            failures += 1
+        if _state(entity._accumulator) != state:
+            print(f"sensor, sample {value} on {day}: reading native_value changed the accumulator")
+            failures += 1
+    return failures
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check the energy accumulator")
+    parser.add_argument("--reads", type=int, default=1000, help="Reads after every sample")
+    args = parser.parse_args()
+
+    accumulator = DailyEnergyAccumulator()
+    failures = 0
+    for (value, day), expected in zip(SAMPLES, EXPECTED):
+        accumulator.update(value, "Online", day)
+        reads = {round(accumulator.total, 3) for _ in range(args.reads)}
+        if reads != {expected}:
+            print(f"sample {value} on {day}: expected {expected}, read {sorted(reads)}")
+            failures += 1
+
+    read_ns = min(timeit.repeat(lambda: accumulator.total, number=100000, repeat=5)) / 100000 * 1e9
+    update_ns = (
+        min(
+            timeit.repeat(
+                lambda: accumulator.update(0.6, "Online", date(2025, 4, 8)), number=100000, repeat=5
+            )
+        )
+        / 100000
+        * 1e9
+    )
+    print(f"read: {read_ns:.0f} ns, update: {update_ns:.0f} ns")
+
+    try:
+        import homeassistant  # noqa: F401
+    except ImportError:
+        print("Home Assistant is not installed, skipping the sensor check")
+    else:
+        failures += check_sensor(args.reads)
+    print(f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Check the stick clock estimate behind the device-day rollover.
+
+Replays polls of a stick whose clock runs a fixed number of seconds ahead of
+the host, with random request latency, and verifies that the drift estimate
+converges, that the rollover lands on the stick's midnight (including on
+the daylight saving days), that setting the stick's clock is detected and
+that a clock that was never set falls back to the host day. Reports the
+cost per observed reading.
+"""
+import argparse
+from datetime import date, datetime, timedelta
+import random
+import sys
+import timeit
+from zoneinfo import ZoneInfo
+
+from bench_common import load_component
+
+load_component()
+from zeversolar.clock import MAX_CLOCK_DRIFT, DeviceClock  # noqa: E402
+
+TIME_ZONE = ZoneInfo("Europe/Amsterdam")
+START = datetime(2025, 3, 29, 23, 50, tzinfo=TIME_ZONE).timestamp()
+
+
+def device_text(timestamp, drift):
+    """Return the stick's "HH:MM DD/MM/YYYY" time at host timestamp."""
+    return datetime.fromtimestamp(timestamp + drift, TIME_ZONE).strftime("%H:%M %d/%m/%Y")
+
+
+def replay(clock, drift, interval, polls, start, rng):
+    """Feed polls to the clock and return the host timestamp after the last."""
+    timestamp = start
+    for _ in range(polls):
+        # Scheduler jitter moves the polls across the stick's minute boundaries
+        timestamp += interval + rng.uniform(-1.0, 1.0)
+        latency = rng.uniform(0.0, 0.3)
+        clock.observe(device_text(timestamp, drift), timestamp + latency)
+    return timestamp
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check the stick clock estimate")
+    parser.add_argument("--drift", type=float, default=37.4, help="Seconds the stick runs ahead")
+    parser.add_argument("--interval", type=float, default=10, help="Seconds between polls")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    failures = 0
+
+    clock = DeviceClock(TIME_ZONE)
+    timestamp = replay(clock, args.drift, args.interval, 360, START, rng)
+    print(f"drift: estimated {clock.drift:.1f} s, true {args.drift:.1f} s, {clock.as_dict()}")
+    if abs(clock.drift - args.drift) > 2:
+        print("drift estimate did not converge")
+        failures += 1
+
+    # 2025-03-30 has 23 hours in Amsterdam, 2025-10-26 has 25
+    for day, hours in ((date(2025, 3, 29), 24), (date(2025, 3, 30), 23), (date(2025, 10, 26), 25)):
+        rollover = clock.rollover_time(day)
+        device_midnight = datetime.fromtimestamp(rollover + clock.drift, TIME_ZONE)
+        length = (rollover - clock.rollover_time(day - timedelta(days=1))) / 3600
+        print(f"{day}: rolls over at device time {device_midnight.isoformat()}, day of {length:.0f} h")
+        if (device_midnight.date(), device_midnight.hour, device_midnight.minute) != (
+            day + timedelta(days=1),
+            0,
+            0,
+        ) or round(length) != hours:
+            print(f"{day}: wrong rollover")
+            failures += 1
+        if clock.day_at(rollover + 1) != day + timedelta(days=1) or clock.day_at(rollover - 1) != day:
+            print(f"{day}: day_at disagrees with the rollover")
+            failures += 1
+
+    # The stick's clock is set back by ten minutes
+    replay(clock, args.drift - 600, args.interval, 60, timestamp, rng)
+    print(f"clock set: estimated {clock.drift:.1f} s, resets {clock.resets}")
+    if clock.resets != 1 or abs(clock.drift - (args.drift - 600)) > 5:
+        print("clock set was not detected")
+        failures += 1
+
+    unset = DeviceClock(TIME_ZONE)
+    unset.observe("00:05 01/01/2000", START)
+    if unset.drift > -MAX_CLOCK_DRIFT or unset.offset != 0.0:
+        print("unset clock was not ignored")
+        failures += 1
+    if unset.observe("garbage", START) or DeviceClock(TIME_ZONE).drift is not None:
+        print("unparsable time was not ignored")
+        failures += 1
+
+    state = {"timestamp": START}
+
+    def observe():
+        state["timestamp"] += 5
+        clock.observe("10:25 27/10/2025", state["timestamp"])
+
+    observe_ns = min(timeit.repeat(observe, number=100000, repeat=5)) / 100000 * 1e9
+    print(f"observe (same minute): {observe_ns:.0f} ns")
+    print(f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
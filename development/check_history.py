@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Check the rolling statistics of the in-memory power sample buffer.
+
+Feeds a random day of samples with irregular spacing into PowerHistory and
+compares mean, minimum, maximum, time at maximum and the daily peak after
+every sample with a naive scan over the same window. Also reports the cost
+of adding a sample and reading the statistics, which should not grow with
+the buffer size, and checks the SampleWindow aggregates published in
+high-frequency sampling mode.
+"""
+import argparse
+from datetime import date
+import random
+import sys
+import timeit
+
+from bench_common import load_component
+
+load_component()
+from zeversolar.history import PowerHistory, SampleWindow  # noqa: E402
+
+
+def naive(samples, timestamp, window, capacity):
+    """Return (mean, minimum, maximum, maximum_time) by scanning the window."""
+    recent = [sample for sample in samples[-capacity:] if sample[0] >= timestamp - window]
+    powers = [power for _, power in recent]
+    maximum = max(powers)
+    return (
+        sum(powers) / len(powers),
+        min(powers),
+        maximum,
+        next(ts for ts, power in recent if power == maximum),
+    )
+
+
+def check_sample_window():
+    """Return the number of wrong SampleWindow aggregates."""
+    window = SampleWindow(max_gap=15)
+    published = []
+    # 5 s samples: a 60 s ramp from 0 to 1200 W, then 60 s flat at 1200 W
+    for step in range(13):
+        window.add(step * 5.0, step * 100.0)
+    published.append(window.publish())
+    for step in range(13, 25):
+        window.add(step * 5.0, 1200.0)
+    published.append(window.publish())
+    # The device drops out for a minute; the gap is not integrated
+    window.add(185.0, 600.0)
+    window.add(190.0, 600.0)
+    published.append(window.publish())
+    published.append(window.publish())
+
+    expected = [(600.0, 1200.0, 10.0), (1200.0, 1200.0, 20.0), (600.0, 600.0, 600.0 * 5 / 3600), None]
+    failures = 0
+    for got, want in zip(published, expected):
+        if (got is None) != (want is None) or (
+            got is not None and any(abs(a - b) > 1e-9 for a, b in zip(got, want))
+        ):
+            print(f"sample window: expected {want}, got {got}")
+            failures += 1
+    return failures
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check the power sample buffer")
+    parser.add_argument("--samples", type=int, default=5000, help="Samples to replay")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = 0
+    for capacity, window in ((512, 300), (16, 300), (512, 30)):
+        history = PowerHistory(capacity, window)
+        samples = []
+        timestamp = 1743984000.0
+        day = date(2025, 4, 7)
+        peak = None
+        for index in range(args.samples):
+            timestamp += rng.choice((1, 5, 15, 60, 400))
+            if index == args.samples // 2:
+                day = date(2025, 4, 8)
+                peak = None
+            power = float(rng.randrange(0, 50) * 100)
+            history.add(timestamp, power, index / 100, day)
+            samples.append((timestamp, power))
+            if peak is None or power > peak[0]:
+                peak = (power, timestamp)
+
+            mean, minimum, maximum, maximum_time = naive(samples, timestamp, window, capacity)
+            got = (history.mean, history.minimum, history.maximum, history.maximum_time)
+            if abs(got[0] - mean) > 1e-6 or got[1:] != (minimum, maximum, maximum_time):
+                print(f"capacity {capacity} window {window} sample {index}: expected "
+                      f"{(mean, minimum, maximum, maximum_time)}, got {got}")
+                failures += 1
+            if (history.peak_today, history.peak_time) != peak:
+                print(f"sample {index}: expected peak {peak}, got "
+                      f"{(history.peak_today, history.peak_time)}")
+                failures += 1
+
+    for capacity in (64, 4096):
+        history = PowerHistory(capacity, window=10**9)
+        state = {"timestamp": 0.0}
+
+        def add():
+            state["timestamp"] += 1
+            history.add(state["timestamp"], (state["timestamp"] * 37) % 5000, 1.0, day)
+
+        add_ns = min(timeit.repeat(add, number=100000, repeat=5)) / 100000 * 1e9
+        read_ns = (
+            min(
+                timeit.repeat(
+                    lambda: (history.mean, history.minimum, history.maximum), number=100000, repeat=5
+                )
+            )
+            / 100000
+            * 1e9
+        )
+        print(f"capacity {capacity}: add {add_ns:.0f} ns, read mean/min/max {read_ns:.0f} ns")
+
+    failures += check_sample_window()
+    print(f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
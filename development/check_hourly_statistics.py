@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Check that the hourly statistics survive a restart within the hour.
+
+Replays an inverter producing a constant 1 kW from 09:00 to 12:00, polled
+every minute, and restarts Home Assistant at 10:50: the integrator and the
+running hour are saved, the polls stop for two minutes and both are
+restored. Every finished hour, including the one of the restart, must
+import 1 kWh. Requires Home Assistant for the recorder models.
+"""
+import argparse
+from datetime import date, datetime, timezone
+import sys
+
+from bench_common import load_component
+
+load_component()
+try:
+    from zeversolar.external_statistics import HourlyStatistics  # noqa: E402
+except ImportError:
+    print("Home Assistant is not installed, skipping the hourly statistics check")
+    sys.exit(0)
+from zeversolar.integrator import EnergyIntegrator  # noqa: E402
+
+START = datetime(2025, 6, 1, 9, 0, tzinfo=timezone.utc).timestamp()
+DAY = date(2025, 6, 1)
+POWER = 1000
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check the hourly statistics across a restart")
+    parser.add_argument("--interval", type=int, default=60, help="Seconds between polls")
+    parser.add_argument("--restart", type=int, default=110, help="Minutes after 09:00 of the restart")
+    parser.add_argument("--downtime", type=int, default=120, help="Seconds Home Assistant is down")
+    args = parser.parse_args()
+    max_gap = 3 * args.interval
+    restart = START + args.restart * 60
+
+    integrator = EnergyIntegrator()
+    hourly = HourlyStatistics()
+    rows = []
+    restarted = False
+    timestamp = START
+    while timestamp <= START + 3 * 3600:
+        if not restarted and timestamp >= restart:
+            saved = integrator.as_dict(), hourly.as_dict()
+            integrator = EnergyIntegrator()
+            integrator.restore(saved[0])
+            hourly = HourlyStatistics()
+            hourly.restore(saved[1])
+            timestamp += args.downtime
+            restarted = True
+        # The device counter has 0.1 kWh resolution and started at 06:00
+        counter = int((timestamp - START + 3 * 3600) / 3600 * POWER / 100) / 10
+        integrator.update(timestamp, POWER, counter, DAY, max_gap)
+        hourly.add(timestamp, POWER, integrator.total)
+        rows.extend(hourly.completed)
+        hourly.completed = []
+        timestamp += args.interval
+
+    failures = 0
+    for hour, energy, minimum, maximum in rows:
+        start = datetime.fromtimestamp(hour, timezone.utc)
+        print(f"{start:%H:%M}: {energy:.3f} kWh, {minimum}-{maximum} W")
+        # The first hour starts with the first sample and misses nothing else
+        if hour > START and abs(energy - 1.0) > 0.01:
+            print(f"{start:%H:%M}: expected 1.000 kWh")
+            failures += 1
+    if len(rows) != 3:
+        print(f"expected 3 finished hours, got {len(rows)}")
+        failures += 1
+    print(f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
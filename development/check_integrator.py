@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Check the Integrated Energy Today sensor's trapezoidal integrator.
+
+Replays a synthetic day: a bell-shaped power curve sampled every 60 s, a
+device counter that only moves in coarse 0.1 kWh steps, an outage, an
+inverter counter restart and a stick that still reports yesterday's counter
+after midnight. Also replays Home Assistant coming back late in the morning
+after being down overnight, with the counter already above yesterday's. Prints the integrated total against the true energy and the
+coarse counter for every gap policy, verifies that the total never
+decreases within a day and stays within the anchor band, and reports the
+cost per sample.
+"""
+import argparse
+from datetime import date, timedelta
+import math
+import sys
+import timeit
+
+from bench_common import load_component
+
+load_component()
+from zeversolar.integrator import ANCHOR_TOLERANCE, GAP_POLICIES, EnergyIntegrator  # noqa: E402
+
+DAY = date(2025, 4, 7)
+START = 1743984000.0  # 2025-04-07 00:00 UTC
+PEAK_POWER = 3000.0
+
+
+def power_at(seconds):
+    """Return the true power at seconds after midnight."""
+    hours = seconds / 3600
+    if not 6 <= hours <= 20:
+        return 0.0
+    return PEAK_POWER * math.sin((hours - 6) / 14 * math.pi) ** 2
+
+
+def replay(policy, interval, outage, restart_at):
+    """Replay the day and return (failures, integrated, true, counter)."""
+    integrator = EnergyIntegrator(policy)
+    failures = 0
+    true_energy = 0.0
+    counter_base = 0.0
+    previous_total = 0.0
+    # The stick still shows yesterday's 12.3 kWh until the inverter starts
+    integrator.update(START - 60, 0.0, 12.3, date(2025, 4, 6), 3 * interval)
+    seconds = 0
+    while seconds < 86400:
+        power = power_at(seconds)
+        true_energy += power * interval / 3_600_000
+        seconds += interval
+        if outage[0] <= seconds < outage[1]:
+            continue
+        if seconds < 6 * 3600:
+            counter = 12.3
+        else:
+            if restart_at and seconds == restart_at:
+                counter_base = true_energy
+            counter = math.floor((true_energy - counter_base) * 10) / 10
+        total = integrator.update(START + seconds, power_at(seconds), counter, DAY, 3 * interval)
+        if total < previous_total - 1e-9:
+            print(f"{policy}: total decreased at {seconds} s: {previous_total} -> {total}")
+            failures += 1
+        device_total = integrator.counter_offset + (integrator.last_counter or 0)
+        if integrator.last_counter is not None and not (
+            device_total - 1e-9 <= total <= max(previous_total, device_total + ANCHOR_TOLERANCE) + 1e-9
+        ):
+            print(f"{policy}: total {total} outside the anchor band at {seconds} s")
+            failures += 1
+        previous_total = total
+    return failures, integrator.total, true_energy, counter_base + counter
+
+
+def replay_downtime(policy, interval):
+    """Return failures after a restart with today's counter above yesterday's."""
+    integrator = EnergyIntegrator(policy)
+    failures = 0
+    yesterday = DAY - timedelta(days=1)
+    # Yesterday ended at 3.0 kWh; Home Assistant was down from 20:00 until 11:00
+    integrator.update(START - 4 * 3600 - interval, 0.0, 3.0, yesterday, 3 * interval)
+    integrator.update(START - 4 * 3600, 0.0, 3.0, yesterday, 3 * interval)
+    counter = 5.0
+    for step in range(13):
+        seconds = 11 * 3600 + step * interval
+        total = integrator.update(START + seconds, 2000.0, counter, DAY, 3 * interval)
+        if total < counter - 1e-9:
+            print(f"{policy}: total {total:.3f} kWh below today's counter {counter:.2f} kWh after downtime")
+            failures += 1
+            break
+        counter = round(counter + 0.01, 2)
+    return failures
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check the energy integrator")
+    parser.add_argument("--interval", type=int, default=60, help="Seconds between samples")
+    args = parser.parse_args()
+
+    failures = 0
+    outage = (11 * 3600, 12 * 3600)
+    for policy in GAP_POLICIES:
+        for restart_at in (0, 14 * 3600):
+            result, integrated, true_energy, counter = replay(policy, args.interval, outage, restart_at)
+            failures += result
+            label = "with counter restart" if restart_at else "no restart"
+            print(
+                f"{policy:6} {label:22}: integrated {integrated:.3f} kWh, "
+                f"true {true_energy:.3f} kWh, counter {counter:.1f} kWh"
+            )
+            if abs(integrated - true_energy) > ANCHOR_TOLERANCE + 0.01:
+                print(f"{policy}: integrated energy off by {integrated - true_energy:.3f} kWh")
+                failures += 1
+
+        result = replay_downtime(policy, args.interval)
+        failures += result
+        print(f"{policy:6} {'restart after downtime':22}: {'ok' if not result else 'FAILED'}")
+
+    integrator = EnergyIntegrator()
+    state = {"timestamp": START}
+
+    def update():
+        state["timestamp"] += 5
+        integrator.update(state["timestamp"], 1500.0, 1.0, DAY, 15)
+
+    update_ns = min(timeit.repeat(update, number=100000, repeat=5)) / 100000 * 1e9
+    print(f"update: {update_ns:.0f} ns")
+    print(f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Check the lifetime, month-to-date and year-to-date energy counters.
+
+Replays two years of daily totals sampled every few minutes, with outages of
+several days, days closed by the scheduled rollover as well as by the first
+sample of the next day, a state saved and restored mid-day and a clock set
+backwards. Verifies every sum against the true totals and reports the cost
+per sample.
+"""
+import argparse
+from datetime import date, timedelta
+import random
+import sys
+import timeit
+
+from bench_common import load_component
+
+load_component()
+from zeversolar.lifetime import LifetimeEnergy  # noqa: E402
+
+START = date(2024, 11, 20)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check the lifetime energy counters")
+    parser.add_argument("--days", type=int, default=730, help="Days to replay")
+    parser.add_argument("--samples", type=int, default=48, help="Samples per day")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    failures = 0
+
+    lifetime = LifetimeEnergy()
+    per_day = {}
+    outage_until = None
+    for offset in range(args.days):
+        day = START + timedelta(days=offset)
+        if outage_until is not None and day < outage_until:
+            continue
+        if rng.random() < 0.01:
+            # Nothing is sampled for a few days
+            outage_until = day + timedelta(days=rng.randint(1, 5))
+            continue
+        if rng.random() < 0.5:
+            lifetime.roll_over(day)
+        final = rng.uniform(0.0, 30.0)
+        for sample in range(1, args.samples + 1):
+            lifetime.update(day, final * sample / args.samples)
+        per_day[day] = final
+        if offset == args.days // 2:
+            restored = LifetimeEnergy()
+            restored.restore(lifetime.as_dict())
+            lifetime = restored
+            # A clock set backwards must neither close nor reopen a day
+            lifetime.update(day - timedelta(days=3), 99.0)
+
+        expected_total = sum(per_day.values())
+        expected_month = sum(
+            energy for closed, energy in per_day.items() if (closed.year, closed.month) == (day.year, day.month)
+        )
+        expected_year = sum(energy for closed, energy in per_day.items() if closed.year == day.year)
+        for name, value, expected in (
+            ("lifetime", lifetime.total, expected_total),
+            ("month", lifetime.month, expected_month),
+            ("year", lifetime.year, expected_year),
+        ):
+            if abs(value - expected) > 1e-6:
+                print(f"{day}: {name} {value:.3f} kWh, expected {expected:.3f} kWh")
+                failures += 1
+
+    print(
+        f"{lifetime.closed_days} closed days, lifetime {lifetime.total:.1f} kWh, "
+        f"month {lifetime.month:.1f} kWh, year {lifetime.year:.1f} kWh"
+    )
+
+    state = {"total": 0.0}
+
+    def update():
+        state["total"] += 0.001
+        lifetime.update(lifetime.date, state["total"])
+
+    update_ns = min(timeit.repeat(update, number=100000, repeat=5)) / 100000 * 1e9
+    print(f"update: {update_ns:.0f} ns")
+    print(f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
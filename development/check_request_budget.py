@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Check the per-host request budget against the stick simulator.
+
+Fires a burst of fetches at one virtual stick from separate clients, the
+way a restart with several entries, a reload and a manual refresh would,
+once without a budget and once with the integration's RequestBudget.
+Reports how many requests the stick had in flight at once, when each
+request started, and how many callers gave up at their deadline.
+"""
+import argparse
+import asyncio
+import sys
+
+import aiohttp
+
+from bench_common import load_component
+from simulator import SimulatorOptions, async_start_simulator
+
+load_component()
+from zeversolar.api import RequestBudget, ZeversolarClient, ZeversolarError  # noqa: E402
+
+
+async def burst(session, url, callers, budget):
+    """Fetch url from several clients at once; return (start offsets, errors)."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    offsets = []
+    errors = 0
+
+    async def fetch():
+        nonlocal errors
+        client = ZeversolarClient(session, url, budget=budget)
+        try:
+            await client.async_get_home()
+        except ZeversolarError:
+            errors += 1
+            return
+        offsets.append(loop.time() - start)
+
+    await asyncio.gather(*(fetch() for _ in range(callers)))
+    return sorted(offsets), errors
+
+
+async def run(args):
+    """Run the burst with and without a budget and return the failures."""
+    runner, base_url = await async_start_simulator(
+        SimulatorOptions(sticks=1, latency=args.latency, jitter=0.0)
+    )
+    app = runner.app
+    url = f"{base_url}/stick/0"
+    failures = 0
+    try:
+        async with aiohttp.ClientSession() as session:
+            for label, budget in (("no budget", None), ("budget", RequestBudget())):
+                app["max_in_flight"] = 0
+                offsets, errors = await burst(session, url, args.callers, budget)
+                print(
+                    f"{label:10}: {args.callers} fetches, max {app['max_in_flight']} in flight, "
+                    f"done after {offsets[-1] if offsets else 0:.2f} s, {errors} gave up"
+                )
+                if budget is not None:
+                    print(f"            {budget.as_dict()}")
+                    if app["max_in_flight"] > budget.max_concurrent:
+                        failures += 1
+    finally:
+        await runner.cleanup()
+    return failures
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check the per-host request budget")
+    parser.add_argument("--callers", type=int, default=12, help="Fetches in the burst")
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated stick latency in seconds")
+    args = parser.parse_args()
+
+    failures = asyncio.run(run(args))
+    print(f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
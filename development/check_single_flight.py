@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Check that concurrent fetches of one stick share a single request.
+
+Starts the stick simulator with a slow response, fires N concurrent fetches
+at the same stick from separate clients (as two entries, a config flow and
+a discovery probe would), and counts the requests the simulator received,
+with and without a shared SingleFlight. Also checks that cancelling one
+caller leaves the shared request running for the others.
+"""
+import argparse
+import asyncio
+import sys
+
+import aiohttp
+
+from bench_common import load_component
+from simulator import SimulatorOptions, async_start_simulator
+
+load_component()
+from zeversolar.api import SingleFlight, ZeversolarClient  # noqa: E402
+
+
+async def fetch_concurrently(session, url, callers, single_flight):
+    """Fetch url from several clients at once and return the bodies."""
+    clients = [ZeversolarClient(session, url, single_flight=single_flight) for _ in range(callers)]
+    return await asyncio.gather(*(client.async_get_home() for client in clients))
+
+
+async def run(args):
+    """Run the checks and return the number of failures."""
+    runner, base_url = await async_start_simulator(
+        SimulatorOptions(sticks=1, latency=args.latency, jitter=0.0)
+    )
+    app = runner.app
+    url = f"{base_url}/stick/0"
+    failures = 0
+    try:
+        async with aiohttp.ClientSession() as session:
+            app["requests"] = 0
+            await fetch_concurrently(session, url, args.callers, None)
+            print(f"{args.callers} concurrent fetches without single-flight: {app['requests']} requests")
+
+            app["requests"] = 0
+            bodies = await fetch_concurrently(session, url, args.callers, SingleFlight())
+            print(f"{args.callers} concurrent fetches with single-flight: {app['requests']} requests")
+            if app["requests"] != 1 or len(set(bodies)) != 1:
+                print("concurrent callers did not share one request")
+                failures += 1
+
+            single_flight = SingleFlight()
+            app["requests"] = 0
+            first = asyncio.ensure_future(ZeversolarClient(session, url, single_flight=single_flight).async_get_home())
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(ZeversolarClient(session, url, single_flight=single_flight).async_get_home())
+            await asyncio.sleep(args.latency / 2)
+            first.cancel()
+            body = await second
+            print(f"cancelled one caller: other caller got {len(body)} bytes, {app['requests']} request")
+            if app["requests"] != 1 or not body:
+                failures += 1
+
+            # Sequential fetches are not coalesced
+            app["requests"] = 0
+            client = ZeversolarClient(session, url, single_flight=single_flight)
+            await client.async_get_home()
+            await client.async_get_home()
+            if app["requests"] != 2:
+                print(f"sequential fetches sent {app['requests']} requests, expected 2")
+                failures += 1
+    finally:
+        await runner.cleanup()
+    return failures
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Check single-flight request coalescing")
+    parser.add_argument("--callers", type=int, default=10, help="Concurrent fetches")
+    parser.add_argument("--latency", type=float, default=0.3, help="Simulated stick latency in seconds")
+    args = parser.parse_args()
+
+    failures = asyncio.run(run(args))
+    print(f"{failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
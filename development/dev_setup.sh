@@ -31,7 +31,7 @@ source venv/bin/activate
 
 # Install dependencies
 echo "Installing dependencies..."
-pip3 install requests voluptuous
+pip3 install requests voluptuous aiohttp
 
 # Run the test script
 echo "Running the test script..."
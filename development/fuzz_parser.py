@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Fuzz the home.cgi parser with the malformed payloads in fuzz_corpus/.
+
+Every corpus file and a number of random mutations of valid payloads are
+parsed. The parser must either return a GatewaySnapshot or raise
+ZeversolarParseError; any other exception is a bug and is reported.
+"""
+import argparse
+import os
+import random
+import sys
+
+from bench_common import load_component, make_home_cgi
+
+load_component()
+from zeversolar.parser import GatewaySnapshot, ZeversolarParseError, parse_home  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fuzz_corpus")
+
+
+def load_corpus():
+    """Return (name, body) for every corpus file."""
+    corpus = []
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, name), "rb") as corpus_file:
+            corpus.append((name, corpus_file.read().decode("utf-8", errors="replace")))
+    return corpus
+
+
+def mutate(body, rng):
+    """Return a randomly damaged copy of body."""
+    lines = body.split("\n")
+    choice = rng.randrange(6)
+    if choice == 0:
+        return body[: rng.randrange(len(body) + 1)]
+    if choice == 1 and lines:
+        del lines[rng.randrange(len(lines))]
+    elif choice == 2 and lines:
+        lines.insert(rng.randrange(len(lines) + 1), rng.choice(["", "OK", "-1", "1e309", "nan", "x" * 512]))
+    elif choice == 3 and len(lines) > 1:
+        first, second = rng.sample(range(len(lines)), 2)
+        lines[first], lines[second] = lines[second], lines[first]
+    elif choice == 4:
+        return "".join(chr(rng.randrange(0, 0x250)) for _ in range(rng.randrange(64)))
+    else:
+        index = rng.randrange(len(body) + 1)
+        return body[:index] + chr(rng.randrange(0, 0x250)) + body[index:]
+    return "\n".join(lines)
+
+
+def check(name, body):
+    """Parse body and return an error string if the parser misbehaves."""
+    try:
+        result = parse_home(body)
+    except ZeversolarParseError:
+        return None
+    except Exception as error:  # noqa: BLE001
+        return f"{name}: {type(error).__name__}: {error}"
+    if not isinstance(result, GatewaySnapshot):
+        return f"{name}: returned {type(result).__name__}"
+    return None
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Fuzz the home.cgi parser")
+    parser.add_argument("--iterations", type=int, default=20000, help="Random mutations to try")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    failures = []
+    for name, body in load_corpus():
+        error = check(name, body)
+        if error:
+            failures.append(error)
+
+    rng = random.Random(args.seed)
+    seeds = [make_home_cgi(inverters=count) for count in (0, 1, 3)]
+    for iteration in range(args.iterations):
+        body = mutate(rng.choice(seeds), rng)
+        error = check(f"mutation {iteration}", body)
+        if error:
+            failures.append(f"{error}\n    payload: {body!r}")
+
+    for failure in failures:
+        print(failure)
+    print(f"{len(failures)} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Fleet load test: drive the real coordinator and scheduler against the simulator.
+
+N coordinators are registered with the shared poll scheduler, each pointing
+at its own virtual stick, and run for a fixed time. The harness reports
+polls per second, p50/p99 poll latency, event-loop lag and memory per
+entry. Requires Home Assistant to be installed.
+"""
+import argparse
+import asyncio
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench_common import async_create_hass, load_integration, percentile
+from simulator import add_simulator_arguments, async_start_simulator, options_from_args
+
+
+async def measure_loop_lag(samples, stop, interval=0.1):
+    """Record how late the event loop wakes a sleeping task, in ms."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append((loop.time() - expected) * 1000)
+
+
+async def run(args):
+    """Run the load test."""
+    integration = load_integration()
+    scheduler_module = sys.modules["custom_components.zeversolar.scheduler"]
+    api = sys.modules["custom_components.zeversolar.api"]
+    const = sys.modules["custom_components.zeversolar.const"]
+    runner, base_url = await async_start_simulator(options_from_args(args))
+    latencies = []
+
+    class TimedCoordinator(integration.ZeversolarDataUpdateCoordinator):
+        """Coordinator that records the duration of every update."""
+
+        async def _async_update_data(self):
+            start = time.perf_counter()
+            try:
+                return await super()._async_update_data()
+            finally:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        # All virtual sticks share the simulator's host; give it the budget
+        # of a whole fleet instead of a single stick's.
+        hass.data.setdefault(const.DOMAIN, {})[const.DATA_REQUEST_BUDGET] = api.RequestBudget(
+            rate=1e9, burst=1e9, max_concurrent=args.entries
+        )
+        scheduler = scheduler_module.ZeversolarPollScheduler(hass, max_concurrent=args.concurrency)
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        coordinators = []
+        unregister = []
+        for index in range(args.entries):
+            coordinator = TimedCoordinator(
+                hass,
+                f"{base_url}/stick/{index % args.sticks}",
+                {"scan_interval": args.interval},
+                f"load_{index}",
+            )
+            coordinator.async_add_listener(lambda: None)
+            unregister.append(scheduler.async_register(coordinator))
+            coordinators.append(coordinator)
+
+        lag = []
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(measure_loop_lag(lag, stop))
+        start = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await lag_task
+
+        gc.collect()
+        per_entry = (tracemalloc.get_traced_memory()[0] - before) / args.entries
+        tracemalloc.stop()
+
+        skipped_ticks = sum(coordinator.metrics.skipped_ticks for coordinator in coordinators)
+        deadline_misses = sum(coordinator.metrics.deadline_misses for coordinator in coordinators)
+        for callback in unregister:
+            callback()
+        await runner.cleanup()
+        await hass.async_stop(force=True)
+
+    polls = len(latencies)
+    print(f"entries={args.entries} interval={args.interval}s duration={elapsed:.1f}s")
+    print(f"polls/s          {polls / elapsed:10.1f}  (expected {args.entries / args.interval:.1f})")
+    print(f"latency p50      {percentile(latencies, 50):10.1f} ms")
+    print(f"latency p99      {percentile(latencies, 99):10.1f} ms")
+    print(f"loop lag p50     {percentile(lag, 50):10.1f} ms")
+    print(f"loop lag p99     {percentile(lag, 99):10.1f} ms")
+    print(f"loop lag max     {max(lag, default=0):10.1f} ms")
+    print(f"skipped ticks    {skipped_ticks:10d}")
+    print(f"deadline misses  {deadline_misses:10d}")
+    print(f"memory/entry     {per_entry / 1024:10.1f} KiB")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Load test the coordinator against the simulator")
+    parser.add_argument("--entries", type=int, default=500, help="Config entries to simulate")
+    parser.add_argument("--interval", type=int, default=10, help="Scan interval in seconds")
+    parser.add_argument("--duration", type=float, default=60, help="Test duration in seconds")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max polls in flight")
+    add_simulator_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Measure the recorder attribute storage saved by unrecorded identity attributes.
+
+Replays one day of polls for a single inverter and counts the state rows
+written for its sensors: Current Power, Energy Today, Energy Today Total,
+Integrated Energy Today and Inverter Status. A row is written when the
+state or the attributes change. For every row it serializes the
+attributes the integration adds, once with all of them recorded and once
+without the identity attributes in ZeversolarEntity._unrecorded_attributes.
+
+Two numbers are reported per variant: the bytes if the attributes were
+copied into every row, and the bytes actually kept by a recorder that
+stores each distinct attribute set once (Home Assistant 2022.4 and later).
+Attributes added by Home Assistant itself (friendly_name, unit, device
+class, ...) are the same in both variants and are left out.
+"""
+import argparse
+import json
+import math
+import sys
+
+from bench_common import load_component
+
+load_component()
+from zeversolar.const import (  # noqa: E402
+    ATTR_HARDWARE_VERSION,
+    ATTR_INVERTER_STATUS,
+    ATTR_REGISTRY_KEY,
+    ATTR_SERIAL_NUMBER,
+    ATTR_SOFTWARE_VERSION,
+)
+
+# Mirrors ZeversolarEntity._unrecorded_attributes
+UNRECORDED = {ATTR_SERIAL_NUMBER, ATTR_REGISTRY_KEY, ATTR_HARDWARE_VERSION, ATTR_SOFTWARE_VERSION}
+
+IDENTITY = {
+    ATTR_SERIAL_NUMBER: "BS8A039900000000",
+    ATTR_REGISTRY_KEY: "RSQMPWSRCRT9RVSZ",
+    ATTR_HARDWARE_VERSION: "M11",
+    ATTR_SOFTWARE_VERSION: "17A31-727R+17829-719R",
+}
+
+
+def replay(interval, peak_power):
+    """Return the list of (entity, state, attributes) rows written in a day."""
+    rows = []
+    previous = {}
+    energy = 0.0
+    for seconds in range(0, 86400, interval):
+        hours = seconds / 3600
+        online = 6 <= hours <= 20
+        power = round(peak_power * math.sin((hours - 6) / 14 * math.pi) ** 2) if online else 0
+        energy += power * interval / 3_600_000
+        status = "OK" if online else "Offline"
+        states = {
+            "current_power": power,
+            "energy_today": round(energy, 2),
+            "energy_today_total": round(energy, 2),
+            "integrated_energy_today": round(energy, 3),
+            "inverter_status": status,
+        }
+        for entity, state in states.items():
+            attributes = {**IDENTITY, ATTR_INVERTER_STATUS: status}
+            if (state, attributes) != previous.get(entity):
+                previous[entity] = (state, attributes)
+                rows.append((entity, state, attributes))
+    return rows
+
+
+def storage(rows, exclude):
+    """Return (bytes copied per row, bytes with shared attribute sets)."""
+    per_row = 0
+    distinct = set()
+    for _, _, attributes in rows:
+        shared = json.dumps(
+            {key: value for key, value in attributes.items() if key not in exclude},
+            separators=(",", ":"),
+        )
+        per_row += len(shared)
+        distinct.add(shared)
+    return per_row, sum(len(shared) for shared in distinct)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Measure recorder attribute storage")
+    parser.add_argument("--interval", type=int, default=60, help="Poll interval in seconds")
+    parser.add_argument("--peak-power", type=int, default=3000, help="Peak power in W")
+    args = parser.parse_args()
+
+    rows = replay(args.interval, args.peak_power)
+    before = storage(rows, set())
+    after = storage(rows, UNRECORDED)
+    print(f"{len(rows)} state rows per day per inverter at a {args.interval} s poll interval")
+    print(f"{'':24}{'all recorded':>14}{'identity unrecorded':>22}{'saved':>10}")
+    for label, index in (("copied per row", 0), ("shared attribute sets", 1)):
+        saved = before[index] - after[index]
+        print(f"{label:24}{before[index]:>12} B{after[index]:>20} B{saved:>8} B")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
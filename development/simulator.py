@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Local simulator for a fleet of Zeversolar Wi-Fi sticks.
+
+Every virtual stick is served under its own path, so the URL of stick 17 is
+http://127.0.0.1:<port>/stick/17 and the integration fetches
+http://127.0.0.1:<port>/stick/17/home.cgi as usual. Sticks follow a daily
+production curve on a simulated clock (optionally accelerated), reset their
+energy counter at midnight, and can be configured to answer slowly, drop
+out, or send malformed payloads.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+import math
+import random
+import sys
+
+from aiohttp import web
+
+
+class SimulatorOptions:
+    """Behaviour shared by all virtual sticks."""
+
+    def __init__(
+        self,
+        sticks=1000,
+        max_inverters=1,
+        latency=0.05,
+        jitter=0.02,
+        dropout=0.0,
+        malformed=0.0,
+        speed=1.0,
+        start=None,
+        night_offline=False,
+        seed=0,
+    ):
+        """Initialize."""
+        self.sticks = sticks
+        self.max_inverters = max_inverters
+        self.latency = latency
+        self.jitter = jitter
+        self.dropout = dropout
+        self.malformed = malformed
+        self.speed = speed
+        self.start = start or datetime.now()
+        self.night_offline = night_offline
+        self.seed = seed
+
+
+class VirtualStick:
+    """One simulated stick with one or more inverters."""
+
+    __slots__ = ("serial", "inverter_serials", "peak_power", "energy", "day", "last_time")
+
+    def __init__(self, index, rng, options):
+        """Initialize."""
+        self.serial = f"SIM{index:09d}"
+        count = rng.randint(1, options.max_inverters)
+        self.inverter_serials = [f"BS{index:09d}{inverter:03d}" for inverter in range(count)]
+        self.peak_power = [rng.randint(1500, 6000) for _ in range(count)]
+        self.energy = [0.0] * count
+        self.day = None
+        self.last_time = None
+
+    @staticmethod
+    def solar_factor(now):
+        """Return the share of peak power at a time of day (0 at night)."""
+        hour = now.hour + now.minute / 60 + now.second / 3600
+        if not 6 <= hour <= 20:
+            return 0.0
+        return math.sin(math.pi * (hour - 6) / 14)
+
+    def advance(self, now, rng):
+        """Integrate energy up to now and return the current power per inverter."""
+        if self.day != now.date():
+            # Midnight: the inverters reset their daily counter
+            self.day = now.date()
+            self.energy = [0.0] * len(self.energy)
+            self.last_time = None
+
+        factor = self.solar_factor(now)
+        powers = [
+            int(peak * factor * rng.uniform(0.6, 1.0)) if factor else 0 for peak in self.peak_power
+        ]
+        if self.last_time is not None:
+            hours = (now - self.last_time).total_seconds() / 3600
+            self.energy = [energy + power * hours / 1000 for energy, power in zip(self.energy, powers)]
+        self.last_time = now
+        return powers
+
+    def body(self, now, rng):
+        """Return the home.cgi body at now."""
+        powers = self.advance(now, rng)
+        lines = [
+            "1",
+            "1",
+            self.serial,
+            "SIMREGISTRYKEY00",
+            "M11",
+            "17A31-727R+17829-719R",
+            now.strftime("%H:%M %d/%m/%Y"),
+            "1",
+            str(len(self.inverter_serials)),
+        ]
+        for serial, power, energy in zip(self.inverter_serials, powers, self.energy):
+            lines += [serial, str(power), f"{energy:.2f}", "OK"]
+        lines.append("Error")
+        return "\n".join(lines) + "\n"
+
+
+def malform(body, rng):
+    """Return a damaged copy of a home.cgi body."""
+    lines = body.split("\n")
+    choice = rng.randrange(3)
+    if choice == 0:
+        return "\n".join(lines[: rng.randrange(len(lines))])
+    if choice == 1:
+        lines[rng.randrange(len(lines))] = "garbage"
+    else:
+        lines.insert(rng.randrange(len(lines)), "")
+    return "\n".join(lines)
+
+
+def create_app(options):
+    """Create the aiohttp application serving all virtual sticks."""
+    rng = random.Random(options.seed)
+    sticks = {}
+    loop_start = None
+
+    def simulated_now():
+        nonlocal loop_start
+        now = asyncio.get_running_loop().time()
+        if loop_start is None:
+            loop_start = now
+        return options.start + timedelta(seconds=(now - loop_start) * options.speed)
+
+    async def home(request):
+        app = request.app
+        app["requests"] += 1
+        app["in_flight"] += 1
+        app["max_in_flight"] = max(app["max_in_flight"], app["in_flight"])
+        try:
+            return await serve(request)
+        finally:
+            app["in_flight"] -= 1
+
+    async def serve(request):
+        index = int(request.match_info["index"])
+        if not 0 <= index < options.sticks:
+            raise web.HTTPNotFound()
+        stick = sticks.get(index)
+        if stick is None:
+            stick = sticks[index] = VirtualStick(index, rng, options)
+
+        now = simulated_now()
+        offline = options.night_offline and not VirtualStick.solar_factor(now)
+        if offline or rng.random() < options.dropout:
+            if rng.random() < 0.5:
+                # Hang like a stick that lost its Wi-Fi link
+                await asyncio.sleep(3600)
+            # Otherwise answer like an overloaded stick
+            return web.Response(status=503)
+
+        if options.latency or options.jitter:
+            await asyncio.sleep(max(0.0, rng.gauss(options.latency, options.jitter)))
+
+        body = stick.body(now, rng)
+        if rng.random() < options.malformed:
+            body = malform(body, rng)
+        return web.Response(text=body)
+
+    app = web.Application()
+    app["requests"] = 0
+    app["in_flight"] = 0
+    app["max_in_flight"] = 0
+    app.router.add_get("/stick/{index}/home.cgi", home)
+    return app
+
+
+async def async_start_simulator(options, host="127.0.0.1", port=0):
+    """Start the simulator and return (runner, base_url)."""
+    runner = web.AppRunner(create_app(options), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port, backlog=4096)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{port}"
+
+
+def add_simulator_arguments(parser):
+    """Add the simulator options to an argument parser."""
+    parser.add_argument("--sticks", type=int, default=1000, help="Number of virtual sticks")
+    parser.add_argument("--max-inverters", type=int, default=1, help="Inverters per stick (random 1..N)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Latency standard deviation in seconds")
+    parser.add_argument("--dropout", type=float, default=0.0, help="Probability a request hangs or is reset")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Probability of a malformed payload")
+    parser.add_argument("--speed", type=float, default=1.0, help="Simulated seconds per real second")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=None, help="Simulated start time (ISO)")
+    parser.add_argument("--night-offline", action="store_true", help="Sticks stop answering at night")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+
+def options_from_args(args):
+    """Build SimulatorOptions from parsed arguments."""
+    return SimulatorOptions(
+        sticks=args.sticks,
+        max_inverters=args.max_inverters,
+        latency=args.latency,
+        jitter=args.jitter,
+        dropout=args.dropout,
+        malformed=args.malformed,
+        speed=args.speed,
+        start=args.start,
+        night_offline=args.night_offline,
+        seed=args.seed,
+    )
+
+
+async def run(args):
+    """Serve until interrupted."""
+    runner, base_url = await async_start_simulator(options_from_args(args), args.host, args.port)
+    print(f"Simulating {args.sticks} sticks at {base_url}/stick/<0..{args.sticks - 1}>")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Simulate a fleet of Zeversolar sticks")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    add_simulator_arguments(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,9 +18,22 @@ mkdir -p "$PACKAGE_DIR/custom_components/zeversolar/translations"
 echo "Copying files..."
 # Core integration files
 cp custom_components/zeversolar/__init__.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/accumulator.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/api.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/breaker.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/clock.py "$PACKAGE_DIR/custom_components/zeversolar/"
 cp custom_components/zeversolar/config_flow.py "$PACKAGE_DIR/custom_components/zeversolar/"
 cp custom_components/zeversolar/const.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/diagnostics.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/discovery.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/external_statistics.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/history.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/integrator.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/lifetime.py "$PACKAGE_DIR/custom_components/zeversolar/"
 cp custom_components/zeversolar/manifest.json "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/metrics.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/parser.py "$PACKAGE_DIR/custom_components/zeversolar/"
+cp custom_components/zeversolar/scheduler.py "$PACKAGE_DIR/custom_components/zeversolar/"
 cp custom_components/zeversolar/sensor.py "$PACKAGE_DIR/custom_components/zeversolar/"
 cp custom_components/zeversolar/translations/en.json "$PACKAGE_DIR/custom_components/zeversolar/translations/"
 